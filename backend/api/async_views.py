@@ -0,0 +1,238 @@
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .instrumentation import timed
+from .models import Professional, ResumeUpload
+from .pagination import AsyncKeysetPagination, InvalidCursor
+from .serializers import (
+    ProfessionalBulkItemSerializer,
+    ProfessionalListSerializer,
+    ProfessionalListValuesSerializer,
+    ResumeUploadSerializer,
+)
+from .services.extraction_queue import enqueue_extraction
+from .services.idempotency import idempotent
+from .services.list_cache import (
+    abump_list_version,
+    acache_page,
+    aget_cached_page,
+    aget_list_version,
+    not_modified,
+    validator_headers,
+)
+from .services.professional_upsert import bulk_upsert_professionals, upsert_professional
+from .services.resume_dedup import Sha256UploadHandler, acache_text, afind_stored_twin, aget_cached_text, sha256_of
+from .services.resume_ingest import astore_and_extract, wants_inline_extraction
+
+logger = logging.getLogger("api")
+
+renderer = JSONRenderer()
+
+
+def _json(data, status: int = 200, headers: dict | None = None) -> HttpResponse:
+    # DRF's renderer, responses are byte for byte the ones the sync views send
+    return HttpResponse(renderer.render(data), status=status, headers=headers, content_type="application/json")
+
+
+def _load_json(request):
+    try:
+        return json.loads(request.body or b"null")
+    except ValueError as e:
+        raise ValueError(f"JSON parse error - {e}")
+
+
+def _upsert_one(data: dict, request: Request) -> tuple[Professional, bool, dict]:
+    # ?include_resume makes the serializer read professional.resume, a sync query; upsert and body in one hop
+    professional, created = upsert_professional(data)
+    return professional, created, ProfessionalListSerializer(professional, context={"request": request}).data
+
+
+class AsyncProfessionalsView(View):
+    """
+    Async (ASGI) version of ProfessionalsView, same payloads
+
+    POST /api/async/professionals/
+    GET  /api/async/professionals/?source=direct|partner|internal&include_resume=true&limit=50&cursor=<next>
+
+    - reads await the ORM (afirst, aiterator), no thread handoff per query; the single upsert
+      statement runs in one hop
+    - `next` is the only link, the async pager is forward only
+    """
+    pagination_class = AsyncKeysetPagination
+
+    async def get(self, request):
+        request = Request(request)  # query_params and build_absolute_uri for the shared helpers
+        version = await aget_list_version()
+        headers = validator_headers(version, request)
+
+        if not_modified(version, request, headers):
+            return HttpResponse(status=304, headers=headers)
+
+        data = await aget_cached_page(version, request)
+        if data is not None:
+            return _json(data, headers=headers)
+
+        qs = Professional.objects.all()
+        source = request.query_params.get("source")
+
+        if source:
+            qs = qs.filter(source=source)
+
+        serializer = ProfessionalListValuesSerializer(request)
+
+        try:
+            rows, next_url = await self.pagination_class().paginate(serializer.values(qs), request)
+        except InvalidCursor as e:
+            return _json({"detail": str(e)}, status=404)
+
+        with timed("serialize"):
+            data = {"next": next_url, "previous": None, "results": serializer.many(rows)}
+        await acache_page(version, request, data)
+
+        logger.info("Fetching professionals (async)", extra={"returned": len(rows), "source": source})
+        return _json(data, headers=headers)
+
+    @idempotent("professionals.create")
+    async def post(self, request):
+        try:
+            payload = _load_json(request)
+        except ValueError as e:
+            return _json({"detail": str(e)}, status=400)
+
+        # no unique validators, they query synchronously; the upsert resolves identities atomically
+        serializer = ProfessionalBulkItemSerializer(data=payload)
+        if not serializer.is_valid():
+            return _json(serializer.errors, status=400)
+
+        try:
+            # one INSERT .. ON CONFLICT statement, raw cursors stay sync
+            professional, created, body = await sync_to_async(_upsert_one)(serializer.validated_data, Request(request))
+        except IntegrityError:
+            return _json({"phone": ["professional with this phone already exists."]}, status=400)
+
+        status_code = 201 if created else 200
+        logger.info(
+            "Created professional" if created else "Updated professional",
+            extra={"professional_id": professional.id, "source": professional.source},
+        )
+
+        return _json(body, status=status_code)
+
+
+class AsyncProfessionalsBulkUpsertView(View):
+    """
+    Async (ASGI) version of ProfessionalsBulkUpsertView
+    POST /api/async/professionals/bulk
+
+    the set based upsert needs a transaction, which the async ORM does not offer yet;
+    the whole batch runs in one thread hop instead of one per query
+    """
+
+    @idempotent("professionals.bulk")
+    async def post(self, request):
+        try:
+            payload = _load_json(request)
+        except ValueError as e:
+            return _json({"detail": str(e)}, status=400)
+
+        if not isinstance(payload, list):
+            return _json({"detail": "Expected a list of profiles."}, status=400)
+
+        summary = await sync_to_async(bulk_upsert_professionals)(payload)
+
+        logger.info(
+            "Bulk upserted professionals (async)",
+            extra={
+                "created_count": summary["created"],
+                "updated_count": summary["updated"],
+                "failed_count": summary["failed"],
+            })
+
+        return _json(summary, status=207)
+
+
+class AsyncResumeUploadView(View):
+    """
+    Async (ASGI) version of ResumeUploadView, same dedup, inline extraction and queue rules
+
+    POST /api/async/professionals/<id>/resume
+    GET  /api/async/professionals/<id>/resume
+
+    storage and extraction run on executor threads and are awaited together,
+    the event loop keeps serving other requests during the PUT
+    """
+
+    async def get(self, request, professional_id: int):
+        resume = await ResumeUpload.objects.filter(professional_id=professional_id).afirst()
+
+        if not resume:
+            return _json({"detail": "resume not found"}, status=404)
+
+        return _json(ResumeUploadSerializer(resume).data)
+
+    async def post(self, request, professional_id: int):
+        # hash while the body is parsed, must be installed before request.FILES is touched
+        request.upload_handlers.insert(0, Sha256UploadHandler(request))
+
+        professional = await Professional.objects.filter(id=professional_id).afirst()
+
+        if not professional:
+            return _json({"detail": "professional not found"}, status=404)
+
+        # multipart parsing spools to disk and hashes, off the event loop
+        pdf = await sync_to_async(lambda: request.FILES.get("file"))()  # FILES parses on first access
+        if not pdf:
+            return _json({"detail": "missing resume file"}, status=400)
+
+        sha256 = getattr(request, "upload_sha256", {}).get("file") or await sync_to_async(sha256_of)(pdf)
+
+        resume = await ResumeUpload.objects.filter(professional=professional).afirst()
+
+        # --------------- same bytes re-uploaded, nothing to store or extract
+        if resume and resume.content_sha256 == sha256 and resume.file:
+            return _json(ResumeUploadSerializer(resume).data)
+
+        resume = resume or ResumeUpload(professional=professional)
+        resume.content_sha256 = sha256
+
+        twin = await afind_stored_twin(sha256, exclude_id=resume.id)
+        if twin:
+            resume.file.name = twin.file.name
+
+        text = await aget_cached_text(sha256)
+        cached = text is not None
+
+        extract_now = not cached and wants_inline_extraction(pdf)
+        if not twin or extract_now:
+            extracted = await astore_and_extract(resume, pdf, store=not twin, extract=extract_now)
+            if extracted is not None:
+                text = extracted
+                await acache_text(sha256, text)
+
+        resume.extracted_text = text or ""
+        resume.extraction_status = (
+            ResumeUpload.ExtractionStatus.DONE if text is not None else ResumeUpload.ExtractionStatus.PENDING
+        )
+        await resume.asave()
+
+        if text is None:
+            await sync_to_async(enqueue_extraction)(resume)  # transaction, stays sync
+
+        await abump_list_version()
+        logger.info(
+            "Uploaded resume (async)",
+            extra={
+                "professional_id": professional.id,
+                "resume_id": resume.id,
+                "stored": not twin,
+                "extraction_cached": cached,
+            })
+
+        return _json(ResumeUploadSerializer(resume).data, status=201 if text is not None else 202)
@@ -0,0 +1,255 @@
+"""
+Per request timings and process wide latency histograms
+
+- RequestMetricsMiddleware opens a bucket per request, `timed(phase)` adds to it from anywhere in the
+  request (views, services, executor threads started with `bind_context`)
+- every query is timed by an execute wrapper installed on each new db connection
+- the bucket becomes a Server-Timing header, structured log fields and /metrics histograms
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+logger = logging.getLogger("api")
+
+PHASES = ("db", "serialize", "storage", "extract")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+
+_current: contextvars.ContextVar[dict | None] = contextvars.ContextVar("api_request_timings", default=None)
+
+
+# --------------------------- per request timings
+
+def _new_bucket() -> dict:
+    return {"db_queries": 0, **{phase: 0.0 for phase in PHASES}}
+
+
+def record(phase: str, seconds: float) -> None:
+    bucket = _current.get()
+    if bucket is not None:
+        bucket[phase] = bucket.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - started)
+
+
+def bind_context(fn):
+    """
+    fn bound to the caller's context, for executor threads; the bucket is shared, not copied
+
+    every call runs in its own copy, a context cannot be entered twice at once when the bound fn is
+    mapped across a pool
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def _time_queries(execute, sql, params, many, context):
+    bucket = _current.get()
+    if bucket is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        bucket["db"] += time.perf_counter() - started
+        bucket["db_queries"] += 1
+
+
+def _install_query_timer(sender, connection, **kwargs):
+    if _time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_queries)
+
+
+def install_query_timer() -> None:
+    """
+    called from ApiConfig.ready, before any connection is opened
+    """
+    connection_created.connect(_install_query_timer, dispatch_uid="api.instrumentation.query_timer")
+
+
+# --------------------------- process wide histograms
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    in process prometheus style registry; every gunicorn/uvicorn worker keeps and serves its own
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests: dict[tuple, int] = defaultdict(int)
+        self.durations: dict[tuple, Histogram] = defaultdict(Histogram)
+        self.phases: dict[tuple, Histogram] = defaultdict(Histogram)
+        self.queries: dict[tuple, int] = defaultdict(int)
+
+    def observe(self, view: str, method: str, status: int, seconds: float, bucket: dict) -> None:
+        with self.lock:
+            self.requests[(view, method, str(status))] += 1
+            self.durations[(view, method)].observe(seconds)
+            self.queries[(view,)] += bucket["db_queries"]
+
+            for phase in PHASES:
+                if bucket[phase]:
+                    self.phases[(view, phase)].observe(bucket[phase])
+
+    def reset(self) -> None:
+        with self.lock:
+            self.__init__()
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        with self.lock:
+            lines += ["# HELP api_requests_total Requests by view, method and status.", "# TYPE api_requests_total counter"]
+            lines += [
+                f'api_requests_total{{view="{v}",method="{m}",status="{s}"}} {n}'
+                for (v, m, s), n in sorted(self.requests.items())
+            ]
+
+            lines += ["# HELP api_db_queries_total Database queries by view.", "# TYPE api_db_queries_total counter"]
+            lines += [f'api_db_queries_total{{view="{v}"}} {n}' for (v,), n in sorted(self.queries.items())]
+
+            lines += self._histogram(
+                "api_request_duration_seconds", "Request latency by view.", ("view", "method"), self.durations,
+            )
+            lines += self._histogram(
+                "api_phase_duration_seconds", "Time per request spent in db, serialize, storage and extract.",
+                ("view", "phase"), self.phases,
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, name: str, help_text: str, label_names: tuple, series: dict) -> list[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+
+        for labels, histogram in sorted(series.items()):
+            label_text = ",".join(f'{key}="{value}"' for key, value in zip(label_names, labels))
+            cumulative = 0
+
+            for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+
+            lines.append(f"{name}_sum{{{label_text}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+        return lines
+
+
+registry = MetricsRegistry()
+
+
+def metrics_view(request):
+    """
+    GET /metrics
+    """
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# --------------------------- middleware
+
+def _server_timing(bucket: dict, total: float) -> str:
+    parts = [f'db;dur={bucket["db"] * 1000:.1f};desc="{bucket["db_queries"]} queries"']
+    parts += [f"{phase};dur={bucket[phase] * 1000:.1f}" for phase in PHASES[1:] if bucket[phase]]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+
+    return match.route or match.view_name or "unknown"
+
+
+class RequestMetricsMiddleware:
+    """
+    outermost middleware, times the whole request; works under wsgi and asgi
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        bucket, token, started = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self._finish(request, response, bucket, started)
+
+    async def __acall__(self, request):
+        bucket, token, started = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self._finish(request, response, bucket, started)
+
+    def _start(self):
+        bucket = _new_bucket()
+        return bucket, _current.set(bucket), time.perf_counter()
+
+    def _finish(self, request, response, bucket: dict, started: float):
+        # streaming bodies are timed up to the first byte
+        total = time.perf_counter() - started
+        view = _view_name(request)
+
+        response["Server-Timing"] = _server_timing(bucket, total)
+        registry.observe(view, request.method, response.status_code, total, bucket)
+
+        logger.info(
+            "Request finished",
+            extra={
+                "view": view,
+                "method": request.method,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 1),
+                "db_queries": bucket["db_queries"],
+                **{f"{phase}_ms": round(bucket[phase] * 1000, 1) for phase in PHASES},
+            })
+
+        return response
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from api.models import ResumeUpload, build_resume_summary
+from api.services.list_cache import bump_list_version
+
+
+class Command(BaseCommand):
+    help = "Fill ResumeUpload.resume_summary for rows extracted before the column existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--all", action="store_true", help="recompute rows that already have a summary")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        qs = ResumeUpload.objects.exclude(extracted_text="").only("id", "extracted_text", "resume_summary")
+        if not options["all"]:
+            qs = qs.filter(resume_summary="")
+
+        updated = 0
+        last_id = 0
+
+        # id ordered chunks rather than one open cursor, we write to the table we are walking
+        while True:
+            batch = list(qs.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not batch:
+                break
+
+            last_id = batch[-1].id
+            changed = []
+
+            for resume in batch:
+                summary = build_resume_summary(resume.extracted_text)
+
+                if summary != resume.resume_summary:
+                    resume.resume_summary = summary
+                    changed.append(resume)
+
+            ResumeUpload.objects.bulk_update(changed, ["resume_summary"])
+            updated += len(changed)
+
+        if updated:
+            bump_list_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill completed. Updated {updated} resume summaries."))
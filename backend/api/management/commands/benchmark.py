@@ -0,0 +1,286 @@
+import io
+import json
+import logging
+import platform
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.services.extraction_queue import extract_with_timeout, extraction_options
+from api.services.resume_extractor import extract_text_from_bytes
+from api.services.synthetic_data import professional, resume_pdf
+
+LOWER = "lower"  # latency
+HIGHER = "higher"  # throughput
+SEED = 42  # synthetic data seed, writes update rows the seed command created
+
+
+def _metric(value: float, unit: str, better: str) -> dict:
+    return {"value": round(value, 3), "unit": unit, "better": better}
+
+
+def _latency_metrics(prefix: str, seconds: list[float]) -> dict:
+    quantiles = statistics.quantiles(seconds, n=100) if len(seconds) > 1 else seconds * 99
+    return {
+        f"{prefix}.p50_ms": _metric(quantiles[49] * 1000, "ms", LOWER),
+        f"{prefix}.p95_ms": _metric(quantiles[94] * 1000, "ms", LOWER),
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    metrics present in both runs that got worse by more than `tolerance` (0.2 = 20%)
+    """
+    regressions = []
+
+    for name, metric in sorted(current["metrics"].items()):
+        before = baseline.get("metrics", {}).get(name)
+        if not before or not before["value"]:
+            continue
+
+        change = (metric["value"] - before["value"]) / before["value"]
+        worse = change if metric["better"] == LOWER else -change
+
+        if worse > tolerance:
+            regressions.append(
+                f"{name}: {before['value']} -> {metric['value']} {metric['unit']} ({worse:+.0%} worse)"
+            )
+
+    return regressions
+
+
+@contextmanager
+def scratch_database(keepdb: bool = False):
+    """
+    a database created and dropped like the test runner's, the configured one is never written to
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+
+    if connection.vendor == "sqlite" and not connection.settings_dict["TEST"].get("NAME"):
+        # the test runner's in-memory default has no WAL and table level locks, not what production sees
+        connection.settings_dict["TEST"]["NAME"] = str(settings.BASE_DIR / "benchmark.sqlite3")
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API hot paths on a scratch database (created and dropped like the test runner's): "
+        "list latency, bulk upsert rows/s, concurrent single upserts and resume extraction. "
+        "Writes JSON, and with --baseline fails when a metric regressed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[10_000], help="seeded professionals, e.g. 10000 100000 1000000",
+        )
+        parser.add_argument("--iterations", type=int, default=50, help="list requests per variant")
+        parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500, 2000])
+        parser.add_argument("--bulk-rows", type=int, default=10_000, help="rows upserted per batch size")
+        parser.add_argument("--posts", type=int, default=500, help="single POST upserts")
+        parser.add_argument("--concurrency", type=int, default=8, help="threads sending the single POSTs")
+        parser.add_argument("--pdfs", type=int, default=20, help="generated resumes to extract")
+        parser.add_argument("--output", help="write results as JSON to this file")
+        parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per metric, 0.2 = 20%%")
+        parser.add_argument("--keepdb", action="store_true", help="keep the scratch database (and its seeded rows)")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        metrics: dict[str, dict] = {}
+        logging.disable(logging.INFO)  # one log line per request would dominate the timings
+
+        try:
+            # measure the queries, not the cache; seeded resume files go to a temporary media root
+            with (
+                scratch_database(options["keepdb"]),
+                tempfile.TemporaryDirectory() as media,
+                override_settings(PROFESSIONALS_LIST_CACHE_TTL=0, MEDIA_ROOT=media),
+            ):
+                for rows in sorted(options["rows"]):
+                    metrics.update(self._list_latency(rows, options["iterations"]))
+
+                metrics.update(self._bulk_upsert(options["batch_sizes"], options["bulk_rows"]))
+                metrics.update(self._concurrent_posts(options["posts"], options["concurrency"]))
+                metrics.update(self._extraction(options["pdfs"]))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        result = {
+            "meta": {
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "vendor": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "options": {
+                    key: options[key]
+                    for key in ("rows", "iterations", "batch_sizes", "bulk_rows", "posts", "concurrency", "pdfs")
+                },
+            },
+            "metrics": metrics,
+        }
+
+        for name, metric in metrics.items():
+            self.stdout.write(f"{name:<48} {metric['value']:>12} {metric['unit']}")
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
+
+        if baseline:
+            if baseline.get("meta", {}).get("options") != result["meta"]["options"]:
+                self.stdout.write(self.style.WARNING("baseline ran with other options, numbers may not compare"))
+
+            regressions = compare(baseline, result, options["tolerance"])
+            if regressions:
+                raise CommandError("performance regressions:\n  " + "\n  ".join(regressions))
+
+            self.stdout.write(self.style.SUCCESS(f"no regressions beyond {options['tolerance']:.0%}"))
+
+    # --------------------------- list
+    def _list_latency(self, rows: int, iterations: int) -> dict:
+        # half of them with a parsed resume; seeding is incremental, each size only adds the tail
+        call_command("seed", count=rows, seed=SEED, with_resumes=True, stdout=io.StringIO())
+
+        client = Client()
+        metrics = {}
+
+        for include_resume in (False, True):
+            path = "/api/professionals/?limit=50" + ("&include_resume=true" if include_resume else "")
+            client.get(path)  # warm up
+
+            seconds = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                response = client.get(path)
+                seconds.append(time.perf_counter() - started)
+
+                if response.status_code != 200:
+                    raise CommandError(f"GET {path} returned {response.status_code}")
+
+            name = f"list.rows_{rows}.include_resume_{str(include_resume).lower()}"
+            metrics.update(_latency_metrics(name, seconds))
+
+        return metrics
+
+    # --------------------------- writes
+    def _bulk_upsert(self, batch_sizes: list[int], total: int) -> dict:
+        client = Client()
+        metrics = {}
+
+        for size in batch_sizes:
+            elapsed = 0.0
+
+            for start in range(0, total, size):
+                # half updates of seeded rows, half new rows
+                batch = [
+                    {**professional(i, SEED), "job_title": f"Bulk {size}"} if i % 2 else
+                    {**professional(i, SEED), "email": f"bulk{size}-{i}@example.com", "phone": None}
+                    for i in range(start, min(start + size, total))
+                ]
+
+                started = time.perf_counter()
+                response = client.post("/api/professionals/bulk", json.dumps(batch), content_type="application/json")
+                elapsed += time.perf_counter() - started
+
+                if response.status_code != 207 or response.json()["failed"]:
+                    raise CommandError(f"bulk upsert failed at batch size {size}: {response.content[:200]!r}")
+
+            metrics[f"bulk_upsert.batch_{size}.rows_per_sec"] = _metric(total / elapsed, "rows/s", HIGHER)
+
+        return metrics
+
+    def _concurrent_posts(self, posts: int, concurrency: int) -> dict:
+        remaining = iter(range(posts))
+        lock = threading.Lock()
+        seconds: list[float] = []
+        errors = 0
+
+        def worker():
+            nonlocal errors
+            client = Client()
+
+            while True:
+                with lock:
+                    i = next(remaining, None)
+                if i is None:
+                    break
+
+                # every fourth request updates an existing signup
+                body = professional(i, SEED)
+                if i % 4:
+                    body.update(email=f"post-{i}@example.com", phone=None)
+
+                started = time.perf_counter()
+                response = client.post("/api/professionals/", json.dumps(body), content_type="application/json")
+                elapsed = time.perf_counter() - started
+
+                with lock:
+                    seconds.append(elapsed)
+                    errors += 0 if response.status_code in (200, 201) else 1
+
+            connection.close()  # per thread connection
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+        wall = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(f"{errors} of {posts} concurrent upserts failed")
+
+        name = f"post_upsert.concurrency_{concurrency}"
+        return {
+            f"{name}.requests_per_sec": _metric(posts / wall, "req/s", HIGHER),
+            **_latency_metrics(name, seconds),
+        }
+
+    # --------------------------- resumes
+    def _extraction(self, count: int) -> dict:
+        corpus = [resume_pdf(seed=i, pages=1 + i % 4) for i in range(count)]
+        options = extraction_options()
+        pages = sum(1 + i % 4 for i in range(count))
+
+        seconds = []
+        for data in corpus:
+            started = time.perf_counter()
+            extract_text_from_bytes(data, **options)
+            seconds.append(time.perf_counter() - started)
+
+        # the upload path: a killable child process per resume
+        inline = []
+        for data in corpus:
+            started = time.perf_counter()
+            extract_with_timeout(data, settings.RESUME_INLINE_EXTRACTION_TIMEOUT, {**options, "workers": 1})
+            inline.append(time.perf_counter() - started)
+
+        return {
+            "extract.pages_per_sec": _metric(pages / sum(seconds), "pages/s", HIGHER),
+            **_latency_metrics("extract.in_process", seconds),
+            **_latency_metrics("extract.inline_child_process", inline),
+        }
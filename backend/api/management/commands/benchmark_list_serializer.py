@@ -0,0 +1,109 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Professional, ResumeUpload
+from api.serializers import ProfessionalListSerializer, ProfessionalListValuesSerializer
+
+from .benchmark import scratch_database
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ProfessionalListSerializer with the values() fast path on synthetic rows, "
+        "in a scratch database created and dropped like the test runner's."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+
+    def handle(self, *args, **options):
+        # the configured database is never touched: no identity clashes with seeded rows, no held write lock
+        with scratch_database():
+            for rows in options["rows"]:
+                try:
+                    with transaction.atomic():
+                        self._seed(rows)
+
+                        for include_resume in (False, True):
+                            self._compare(rows, include_resume, options["repeat"])
+
+                        raise _Rollback()  # each size starts from an empty table
+                except _Rollback:
+                    pass
+
+    def _seed(self, rows: int) -> None:
+        professionals = Professional.objects.bulk_create(
+            [
+                Professional(
+                    full_name=f"Bench Person {i}",
+                    email=f"bench{i}@example.com",
+                    phone=f"555{i:07d}",
+                    company_name="Bench Co",
+                    job_title="Engineer",
+                    source=Professional.Source.PARTNER,
+                )
+                for i in range(rows)
+            ],
+            batch_size=2000,
+        )
+
+        # every other professional has a resume
+        ResumeUpload.objects.bulk_create(
+            [
+                ResumeUpload(
+                    professional=professional,
+                    file=f"resumes/{professional.id}/resume.pdf",
+                    extracted_text="",
+                    resume_summary="bench resume summary",
+                    extraction_status=ResumeUpload.ExtractionStatus.DONE,
+                )
+                for professional in professionals[::2]
+            ],
+            batch_size=2000,
+        )
+
+    def _compare(self, rows: int, include_resume: bool, repeat: int) -> None:
+        path = "/api/professionals/" + ("?include_resume=true" if include_resume else "")
+        request = Request(APIRequestFactory().get(path, HTTP_HOST="localhost"))
+        qs = Professional.objects.order_by("-created_at", "-id")
+
+        def drf():
+            page = ProfessionalListSerializer.get_optimized_queryset(qs, request)
+            return ProfessionalListSerializer(list(page), many=True, context={"request": request}).data
+
+        def fast():
+            serializer = ProfessionalListValuesSerializer(request)
+            return serializer.many(serializer.values(qs))
+
+        drf_seconds, drf_data = self._best_of(drf, repeat)
+        fast_seconds, fast_data = self._best_of(fast, repeat)
+
+        renderer = JSONRenderer()
+        if renderer.render(drf_data) != renderer.render(fast_data):
+            raise CommandError(f"fast path output differs at rows={rows} include_resume={include_resume}")
+
+        self.stdout.write(
+            f"rows={rows:<7} include_resume={str(include_resume).lower():<5} "
+            f"drf={drf_seconds * 1000:8.1f}ms fast={fast_seconds * 1000:8.1f}ms "
+            f"speedup={drf_seconds / fast_seconds:4.1f}x (identical output)"
+        )
+
+    def _best_of(self, fn, repeat: int):
+        best, result = float("inf"), None
+
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+
+        return best, result
@@ -0,0 +1,51 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.professional_import import IMPORT_CHUNK_SIZE, import_records, iter_records
+
+
+class Command(BaseCommand):
+    help = "Stream an NDJSON or CSV partner feed into professionals, upserting in chunks with one commit per chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="feed file, .ndjson/.jsonl or .csv")
+        parser.add_argument("--format", choices=["ndjson", "csv"], help="defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument("--report", help="write every per-line result to this NDJSON file")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        fmt = options["format"] or {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(path.suffix.lower())
+        if not fmt:
+            raise CommandError("cannot infer the format from the file extension, pass --format")
+
+        report = open(options["report"], "w") if options["report"] else None
+        started = time.monotonic()
+
+        try:
+            with open(path, "rb") as stream:
+                for result in import_records(iter_records(stream, fmt), chunk_size=max(options["chunk_size"], 1)):
+                    if report:
+                        report.write(json.dumps(result) + "\n")
+
+                    if result.get("summary"):
+                        summary = result
+                    elif result["status"] == "failed" and not report:
+                        self.stderr.write(f"line {result['line']}: {result['error']}")
+        finally:
+            if report:
+                report.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import completed in {elapsed:.1f}s ({summary['lines'] / max(elapsed, 1e-9):.0f} rows/s). "
+                f"Created {summary['created']}, updated {summary['updated']}, failed {summary['failed']}."
+            )
+        )
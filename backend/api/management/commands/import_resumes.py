@@ -0,0 +1,75 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.resume_batch import (
+    BATCH_BYTES,
+    BATCH_FILES,
+    ResumeBatchError,
+    ingest_resumes,
+    iter_archive,
+    iter_directory,
+    parse_manifest,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Attach resumes in bulk from a zip/tar archive or a directory, matched to professionals by a manifest "
+        "(file + professional_id, email or phone). Extraction runs across a process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="zip, tar(.gz) or a directory of files")
+        parser.add_argument("--manifest", required=True, help="JSON list or CSV with a header")
+        parser.add_argument("--workers", type=int, help="extraction processes, defaults to RESUME_BATCH_WORKERS")
+        parser.add_argument("--batch-files", type=int, default=BATCH_FILES, help="files per batch and transaction")
+        parser.add_argument(
+            "--batch-mb", type=int, default=BATCH_BYTES // (1024 * 1024), help="file bytes held in memory per batch",
+        )
+        parser.add_argument("--report", help="write every per-file result to this NDJSON file")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        started = time.monotonic()
+
+        try:
+            manifest = parse_manifest(Path(options["manifest"]).read_bytes())
+
+            if path.is_dir():
+                summary = self._ingest(iter_directory(str(path)), manifest, options)
+            else:
+                with open(path, "rb") as stream:
+                    summary = self._ingest(iter_archive(stream), manifest, options)
+        except (OSError, ResumeBatchError) as e:
+            raise CommandError(str(e))
+
+        if options["report"]:
+            with open(options["report"], "w") as report:
+                for result in summary["results"]:
+                    report.write(json.dumps(result) + "\n")
+        else:
+            for result in summary["results"]:
+                if result["status"] == "failed":
+                    self.stderr.write(f"{result['file']}: {result['error']}")
+
+        elapsed = time.monotonic() - started
+        files = len(summary["results"]) - summary["failed"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resume import completed in {elapsed:.1f}s ({files / max(elapsed, 1e-9):.1f} files/s). "
+                f"Created {summary['created']}, updated {summary['updated']}, unchanged {summary['unchanged']}, "
+                f"failed {summary['failed']}, queued {summary['queued']}, skipped {summary['skipped']}."
+            )
+        )
+
+    def _ingest(self, members, manifest: list[dict], options: dict) -> dict:
+        return ingest_resumes(
+            members, manifest, workers=options["workers"], batch_files=max(options["batch_files"], 1),
+            batch_bytes=max(options["batch_mb"], 1) * 1024 * 1024,
+        )
@@ -0,0 +1,78 @@
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GETs at a running deployment and report throughput and latency, "
+        "e.g. gunicorn (wsgi, :8000) against uvicorn (asgi, :8001)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+", help="one or more urls, each is measured separately")
+        parser.add_argument("--concurrency", type=int, default=64, help="simultaneous keep-alive connections")
+        parser.add_argument("--requests", type=int, default=2000, help="requests per url")
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        for url in options["urls"]:
+            self._run(url, options["concurrency"], options["requests"], options["timeout"])
+
+    def _run(self, url: str, concurrency: int, total: int, timeout: float) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise CommandError("only plain http urls are supported")
+
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        remaining = iter(range(total))
+        lock = threading.Lock()
+        latencies: list[float] = []
+        errors = 0
+
+        def worker():
+            nonlocal errors
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        break
+
+                started = time.perf_counter()
+                try:
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status < 400
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+                    ok = False
+
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    errors += 0 if ok else 1
+
+            conn.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+        wall = time.perf_counter() - started
+
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f"{url}\n"
+            f"  {len(latencies)} requests, {concurrency} connections, {errors} errors in {wall:.2f}s "
+            f"-> {len(latencies) / wall:.0f} req/s\n"
+            f"  latency p50={quantiles[49] * 1000:.1f}ms p95={quantiles[94] * 1000:.1f}ms "
+            f"p99={quantiles[98] * 1000:.1f}ms max={max(latencies) * 1000:.1f}ms"
+        )
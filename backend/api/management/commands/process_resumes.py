@@ -0,0 +1,44 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.services.extraction_queue import process_pending_jobs, run_worker
+
+
+class Command(BaseCommand):
+    help = "Drain the resume extraction queue; runs forever unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="worker processes polling the queue")
+        parser.add_argument("--timeout", type=int, default=None, help="seconds per pdf before the attempt is killed")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="process runnable jobs and exit")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            processed = process_pending_jobs(timeout=options["timeout"])
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} extraction jobs."))
+            return
+
+        workers = max(options["workers"], 1)
+        self.stdout.write(f"Starting {workers} extraction worker(s)...")
+
+        if workers == 1:
+            run_worker(poll_interval=options["poll_interval"], timeout=options["timeout"])
+            return
+
+        # children must not share the parent's db connection
+        connections.close_all()
+        ctx = multiprocessing.get_context("fork")
+
+        processes = [
+            ctx.Process(target=run_worker, args=(options["poll_interval"], options["timeout"]), daemon=False)
+            for _ in range(workers)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.services.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys past IDEMPOTENCY_KEY_TTL (run from cron, expired keys are also replaced on reuse)."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys."))
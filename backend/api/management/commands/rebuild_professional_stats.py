@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.services.list_cache import bump_list_version
+from api.services.professional_stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recreate the professional stats sync triggers and recount the summary tables from professionals."
+
+    def handle(self, *args, **options):
+        rebuild_stats()
+        bump_list_version()  # stats responses are validated against the list version
+
+        self.stdout.write(self.style.SUCCESS("Professional stats rebuilt."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.services.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the full-text search table and its sync triggers, then repopulate it from professionals and resumes."
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            install_search_index(schema_editor, rebuild=True)
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,118 @@
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from api.models import Professional
+from api.services.list_cache import bump_list_version
+from api.services.resume_reextract import CHUNK_SIZE, IO_THREADS, Reextractor, reextract_queryset
+
+
+def _since(value: str) -> datetime:
+    parsed = parse_datetime(value)
+
+    if parsed is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(value)
+        parsed = datetime.combine(date, datetime.min.time())
+
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-extract text for resumes already in storage (after an extractor or pypdf change), "
+        "in id ordered chunks with a resumable checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=_since, help="only resumes uploaded at or after this date/datetime")
+        parser.add_argument("--source", choices=Professional.Source.values, help="only this professional source")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="resumes per chunk and bulk_update")
+        parser.add_argument("--workers", type=int, help="extraction processes, defaults to RESUME_BATCH_WORKERS")
+        parser.add_argument("--io-threads", type=int, default=IO_THREADS, help="concurrent storage reads")
+        parser.add_argument("--timeout", type=float, help="seconds per pdf, defaults to RESUME_EXTRACTION_TIMEOUT")
+        parser.add_argument("--checkpoint", help="JSON file with the last id done, an interrupted run continues from it")
+        parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+
+    def handle(self, *args, **options):
+        filters = {"since": options["since"] and options["since"].isoformat(), "source": options["source"]}
+        state = self._load_checkpoint(options["checkpoint"], filters, options["restart"])
+
+        qs = reextract_queryset(options["since"], options["source"]).only(
+            "id", "file", "content_sha256", "extracted_text", "extraction_status",
+        )
+        total = qs.filter(id__gt=state["last_id"]).count()
+        chunk_size = max(options["chunk_size"], 1)
+
+        if state["last_id"]:
+            self.stdout.write(f"Continuing after resume {state['last_id']}, {total} left.")
+
+        started = time.monotonic()
+        done = 0
+
+        with Reextractor(options["workers"], options["io_threads"], options["timeout"]) as reextractor:
+            while True:
+                # id ordered chunks rather than one open cursor, we write to the table we are walking
+                chunk = list(qs.filter(id__gt=state["last_id"]).order_by("id")[:chunk_size].iterator())
+                if not chunk:
+                    break
+
+                result = reextractor.run_chunk(chunk)
+
+                for resume_id, error in result.pop("failures").items():
+                    self.stderr.write(f"resume {resume_id}: {error}")
+
+                for key, value in result.items():
+                    state["counts"][key] = state["counts"].get(key, 0) + value
+                state["last_id"] = chunk[-1].id
+                self._save_checkpoint(options["checkpoint"], state)
+
+                if result["updated"]:
+                    bump_list_version()  # resume_summary changed, per chunk so a long run shows progress
+
+                done += len(chunk)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{done}/{total} resumes, {done / max(elapsed, 1e-9):.1f}/s, "
+                    f"eta {(total - done) * elapsed / done:.0f}s"
+                )
+
+        elapsed = time.monotonic() - started
+        counts = state["counts"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-extraction completed in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.1f} resumes/s). "
+                f"Updated {counts['updated']}, unchanged {counts['unchanged']}, failed {counts['failed']}, "
+                f"replaced by a new upload {counts.get('replaced', 0)}."
+            )
+        )
+
+    def _load_checkpoint(self, path: str | None, filters: dict, restart: bool) -> dict:
+        fresh = {"filters": filters, "last_id": 0, "counts": {"updated": 0, "unchanged": 0, "replaced": 0, "failed": 0}}
+
+        if not path or restart or not os.path.exists(path):
+            return fresh
+
+        with open(path) as f:
+            state = json.load(f)
+
+        if state.get("filters") != filters:
+            raise CommandError(f"{path} was written with other filters {state.get('filters')}, pass --restart")
+
+        return state
+
+    def _save_checkpoint(self, path: str | None, state: dict) -> None:
+        if not path:
+            return
+
+        # never a half written file, a crash keeps the previous checkpoint
+        tmp = Path(f"{path}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="professional",
+            index=models.Index(
+                fields=["source", "created_at", "id"],
+                name="professional_source_created",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="professional",
+            index=models.Index(fields=["created_at", "id"], name="professional_created"),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0003_resume_extraction_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resumeupload",
+            name="content_sha256",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+    ]
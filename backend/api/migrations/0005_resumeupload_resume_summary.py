@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0004_resumeupload_content_sha256"),
+    ]
+
+    operations = [
+        # existing rows are filled by `manage.py backfill_resume_summaries`
+        migrations.AddField(
+            model_name="resumeupload",
+            name="resume_summary",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -0,0 +1,161 @@
+from django.db import migrations
+
+# frozen copy of the sql services.search installed when this migration was written,
+# later changes to the service do not rewrite history
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_professional_fts USING fts5(
+        full_name, company_name, job_title, resume_text,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_ai AFTER INSERT ON api_professional BEGIN
+        INSERT INTO api_professional_fts (rowid, full_name, company_name, job_title, resume_text)
+        VALUES (new.id, new.full_name, new.company_name, new.job_title, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_au
+    AFTER UPDATE OF full_name, company_name, job_title ON api_professional BEGIN
+        UPDATE api_professional_fts
+        SET full_name = new.full_name, company_name = new.company_name, job_title = new.job_title
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_ad AFTER DELETE ON api_professional BEGIN
+        DELETE FROM api_professional_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_ai AFTER INSERT ON api_resumeupload BEGIN
+        UPDATE api_professional_fts SET resume_text = new.extracted_text WHERE rowid = new.professional_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_au AFTER UPDATE OF extracted_text ON api_resumeupload BEGIN
+        UPDATE api_professional_fts SET resume_text = new.extracted_text WHERE rowid = new.professional_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_ad AFTER DELETE ON api_resumeupload BEGIN
+        UPDATE api_professional_fts SET resume_text = '' WHERE rowid = old.professional_id;
+    END
+    """,
+]
+
+SQLITE_REBUILD = [
+    "DELETE FROM api_professional_fts",
+    """
+    INSERT INTO api_professional_fts (rowid, full_name, company_name, job_title, resume_text)
+    SELECT p.id, p.full_name, p.company_name, p.job_title, COALESCE(r.extracted_text, '')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_professional_fts_ai",
+    "DROP TRIGGER IF EXISTS api_professional_fts_au",
+    "DROP TRIGGER IF EXISTS api_professional_fts_ad",
+    "DROP TRIGGER IF EXISTS api_resumeupload_fts_ai",
+    "DROP TRIGGER IF EXISTS api_resumeupload_fts_au",
+    "DROP TRIGGER IF EXISTS api_resumeupload_fts_ad",
+    "DROP TABLE IF EXISTS api_professional_fts",
+]
+
+PG_INSTALL = [
+    """
+    CREATE TABLE IF NOT EXISTS api_professional_search (
+        professional_id bigint PRIMARY KEY REFERENCES api_professional (id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS api_professional_search_document ON api_professional_search USING GIN (document)",
+    """
+    CREATE OR REPLACE FUNCTION api_professional_search_refresh(pid bigint) RETURNS void AS $$
+        INSERT INTO api_professional_search (professional_id, document)
+        SELECT p.id,
+            setweight(to_tsvector('simple', coalesce(p.full_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(p.company_name, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(p.job_title, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(r.extracted_text, '')), 'D')
+        FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+        WHERE p.id = pid
+        ON CONFLICT (professional_id) DO UPDATE SET document = excluded.document;
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION api_professional_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'api_professional' THEN
+            PERFORM api_professional_search_refresh(NEW.id);
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM api_professional_search_refresh(OLD.professional_id);
+        ELSE
+            PERFORM api_professional_search_refresh(NEW.professional_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_search_sync ON api_professional",
+    """
+    CREATE TRIGGER api_professional_search_sync
+    AFTER INSERT OR UPDATE OF full_name, company_name, job_title ON api_professional
+    FOR EACH ROW EXECUTE FUNCTION api_professional_search_sync()
+    """,
+    "DROP TRIGGER IF EXISTS api_resumeupload_search_sync ON api_resumeupload",
+    """
+    CREATE TRIGGER api_resumeupload_search_sync
+    AFTER INSERT OR DELETE OR UPDATE OF extracted_text ON api_resumeupload
+    FOR EACH ROW EXECUTE FUNCTION api_professional_search_sync()
+    """,
+]
+
+PG_REBUILD = [
+    "TRUNCATE api_professional_search",
+    """
+    INSERT INTO api_professional_search (professional_id, document)
+    SELECT p.id,
+        setweight(to_tsvector('simple', coalesce(p.full_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(p.company_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(p.job_title, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(r.extracted_text, '')), 'D')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+PG_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_professional_search_sync ON api_professional",
+    "DROP TRIGGER IF EXISTS api_resumeupload_search_sync ON api_resumeupload",
+    "DROP FUNCTION IF EXISTS api_professional_search_sync()",
+    "DROP FUNCTION IF EXISTS api_professional_search_refresh(bigint)",
+    "DROP TABLE IF EXISTS api_professional_search",
+]
+
+
+def _statements(schema_editor, sqlite: list[str], postgres: list[str]) -> list[str]:
+    return {"sqlite": sqlite, "postgresql": postgres}.get(schema_editor.connection.vendor, [])
+
+
+def forwards(apps, schema_editor):
+    for sql in _statements(schema_editor, SQLITE_INSTALL + SQLITE_REBUILD, PG_INSTALL + PG_REBUILD):
+        schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    for sql in _statements(schema_editor, SQLITE_UNINSTALL, PG_UNINSTALL):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0005_resumeupload_resume_summary"),
+    ]
+
+    operations = [
+        # fts5 table + triggers on sqlite, tsvector table + triggers on postgres
+        migrations.RunPython(forwards, backwards),
+    ]
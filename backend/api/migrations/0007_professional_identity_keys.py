@@ -0,0 +1,110 @@
+import re
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+MERGED_FIELDS = ("email", "phone", "company_name", "job_title")
+
+# the search index rows as 0006 builds them, frozen here
+SEARCH_SQLITE_REBUILD = [
+    "DELETE FROM api_professional_fts",
+    """
+    INSERT INTO api_professional_fts (rowid, full_name, company_name, job_title, resume_text)
+    SELECT p.id, p.full_name, p.company_name, p.job_title, COALESCE(r.extracted_text, '')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+SEARCH_PG_REBUILD = [
+    "TRUNCATE api_professional_search",
+    """
+    INSERT INTO api_professional_search (professional_id, document)
+    SELECT p.id,
+        setweight(to_tsvector('simple', coalesce(p.full_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(p.company_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(p.job_title, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(r.extracted_text, '')), 'D')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+
+def _merge(Professional, ResumeUpload, rows: list) -> int:
+    """
+    the oldest row wins, blanks are filled from the newer duplicates and a resume moves over when it has none
+    """
+    keeper, *others = sorted(rows, key=lambda p: p.id)
+    has_resume = ResumeUpload.objects.filter(professional_id=keeper.id).exists()
+
+    for other in others:
+        for field in MERGED_FIELDS:
+            if not getattr(keeper, field) and getattr(other, field):
+                setattr(keeper, field, getattr(other, field))
+
+        if not has_resume:
+            has_resume = bool(ResumeUpload.objects.filter(professional_id=other.id).update(professional_id=keeper.id))
+
+    Professional.objects.filter(id__in=[other.id for other in others]).delete()  # frees their identities
+    keeper.save()
+    return len(others)
+
+
+def _same_person(a, b) -> bool:
+    # a phone match alone does not make two different emails one professional
+    return not a.email or not b.email or a.email.lower() == b.email.lower()
+
+
+def forwards(apps, schema_editor):
+    Professional = apps.get_model("api", "Professional")
+    ResumeUpload = apps.get_model("api", "ResumeUpload")
+    merged = 0
+
+    # ---- emails differing only by case
+    duplicated = (
+        Professional.objects.exclude(email=None).values(email_key=Lower("email"))
+        .annotate(n=Count("id")).filter(n__gt=1).values_list("email_key", flat=True)
+    )
+    for email_key in list(duplicated):
+        rows = Professional.objects.alias(key=Lower("email")).filter(key=email_key)
+        merged += _merge(Professional, ResumeUpload, list(rows))
+
+    # ---- phones stored before they were canonical digits
+    for professional in Professional.objects.filter(phone__regex=r"\D"):
+        digits = re.sub(r"\D", "", professional.phone) or None
+        owner = Professional.objects.filter(phone=digits).exclude(id=professional.id).first() if digits else None
+
+        if owner and _same_person(owner, professional):
+            professional.phone = None  # the owner's digits, whichever row survives the merge
+            merged += _merge(Professional, ResumeUpload, [owner, professional])
+        elif owner:
+            # two people behind one number (different emails), both rows stay, the phone with the owner
+            professional.phone = None
+            professional.save(update_fields=["phone"])
+        else:
+            professional.phone = digits
+            professional.save(update_fields=["phone"])
+
+    if merged:
+        # the sync triggers do not follow a resume moving to another professional
+        rebuild = {"sqlite": SEARCH_SQLITE_REBUILD, "postgresql": SEARCH_PG_REBUILD}
+        for sql in rebuild.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    if merged and schema_editor.connection.vendor == "postgresql":
+        # deferred foreign key checks of the deletes must fire before the index is built in this transaction
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0006_professional_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="professional",
+            constraint=models.UniqueConstraint(Lower("email"), name="professional_email_ci_unique"),
+        ),
+    ]
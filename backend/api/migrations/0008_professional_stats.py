@@ -0,0 +1,224 @@
+from django.db import migrations, models
+
+# frozen copy of the sql services.professional_stats installed when this migration was written,
+# later changes to the service do not rewrite history
+
+SQLITE_INSTALL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_ai AFTER INSERT ON api_professional BEGIN
+        INSERT INTO api_professionaldailystat (day, source, count) VALUES (date(new.created_at), new.source, 1)
+        ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('company_name', new.company_name, 1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('job_title', new.job_title, 1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_au_daily
+    AFTER UPDATE OF created_at, source ON api_professional
+    WHEN date(old.created_at) IS NOT date(new.created_at) OR old.source IS NOT new.source BEGIN
+        INSERT INTO api_professionaldailystat (day, source, count) VALUES (date(old.created_at), old.source, -1)
+        ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionaldailystat (day, source, count) VALUES (date(new.created_at), new.source, 1)
+        ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_au_company_name
+    AFTER UPDATE OF company_name ON api_professional WHEN old.company_name IS NOT new.company_name BEGIN
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('company_name', old.company_name, -1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('company_name', new.company_name, 1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_au_job_title
+    AFTER UPDATE OF job_title ON api_professional WHEN old.job_title IS NOT new.job_title BEGIN
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('job_title', old.job_title, -1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('job_title', new.job_title, 1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_ad AFTER DELETE ON api_professional BEGIN
+        INSERT INTO api_professionaldailystat (day, source, count) VALUES (date(old.created_at), old.source, -1)
+        ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('company_name', old.company_name, -1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO api_professionalgroupstat (dimension, value, count) VALUES ('job_title', old.job_title, -1)
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_professional_stats_ai",
+    "DROP TRIGGER IF EXISTS api_professional_stats_au_daily",
+    "DROP TRIGGER IF EXISTS api_professional_stats_au_company_name",
+    "DROP TRIGGER IF EXISTS api_professional_stats_au_job_title",
+    "DROP TRIGGER IF EXISTS api_professional_stats_ad",
+]
+
+PG_INSTALL = [
+    """
+    CREATE OR REPLACE FUNCTION api_professional_stats_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, 1 AS n FROM new_rows
+            )
+            INSERT INTO api_professionaldailystat (day, source, count)
+            SELECT (created_at AT TIME ZONE 'UTC')::date, source, SUM(n) FROM d
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (day, source) DO UPDATE SET count = api_professionaldailystat.count + excluded.count;
+
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, 1 AS n FROM new_rows
+            )
+            INSERT INTO api_professionalgroupstat (dimension, value, count)
+            SELECT dimension, value, SUM(n) FROM (
+                SELECT 'company_name' AS dimension, company_name AS value, n FROM d
+                UNION ALL SELECT 'job_title' AS dimension, job_title AS value, n FROM d
+            ) g
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (dimension, value) DO UPDATE SET count = api_professionalgroupstat.count + excluded.count;
+        ELSIF TG_OP = 'UPDATE' THEN
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, 1 AS n FROM new_rows
+                UNION ALL SELECT created_at, source, company_name, job_title, -1 AS n FROM old_rows
+            )
+            INSERT INTO api_professionaldailystat (day, source, count)
+            SELECT (created_at AT TIME ZONE 'UTC')::date, source, SUM(n) FROM d
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (day, source) DO UPDATE SET count = api_professionaldailystat.count + excluded.count;
+
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, 1 AS n FROM new_rows
+                UNION ALL SELECT created_at, source, company_name, job_title, -1 AS n FROM old_rows
+            )
+            INSERT INTO api_professionalgroupstat (dimension, value, count)
+            SELECT dimension, value, SUM(n) FROM (
+                SELECT 'company_name' AS dimension, company_name AS value, n FROM d
+                UNION ALL SELECT 'job_title' AS dimension, job_title AS value, n FROM d
+            ) g
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (dimension, value) DO UPDATE SET count = api_professionalgroupstat.count + excluded.count;
+        ELSE
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, -1 AS n FROM old_rows
+            )
+            INSERT INTO api_professionaldailystat (day, source, count)
+            SELECT (created_at AT TIME ZONE 'UTC')::date, source, SUM(n) FROM d
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (day, source) DO UPDATE SET count = api_professionaldailystat.count + excluded.count;
+
+            WITH d AS (
+                SELECT created_at, source, company_name, job_title, -1 AS n FROM old_rows
+            )
+            INSERT INTO api_professionalgroupstat (dimension, value, count)
+            SELECT dimension, value, SUM(n) FROM (
+                SELECT 'company_name' AS dimension, company_name AS value, n FROM d
+                UNION ALL SELECT 'job_title' AS dimension, job_title AS value, n FROM d
+            ) g
+            GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+            ON CONFLICT (dimension, value) DO UPDATE SET count = api_professionalgroupstat.count + excluded.count;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_stats_ai ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_ai AFTER INSERT ON api_professional
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_stats_au ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_au AFTER UPDATE ON api_professional
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_stats_ad ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_ad AFTER DELETE ON api_professional
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+]
+
+PG_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_professional_stats_ai ON api_professional",
+    "DROP TRIGGER IF EXISTS api_professional_stats_au ON api_professional",
+    "DROP TRIGGER IF EXISTS api_professional_stats_ad ON api_professional",
+    "DROP FUNCTION IF EXISTS api_professional_stats_sync()",
+]
+
+
+def _count(day: str) -> list[str]:
+    return [
+        f"""
+        INSERT INTO api_professionaldailystat (day, source, count)
+        SELECT {day}, source, COUNT(*) FROM api_professional GROUP BY 1, 2
+        """,
+        """
+        INSERT INTO api_professionalgroupstat (dimension, value, count)
+        SELECT dimension, value, COUNT(*) FROM (
+            SELECT 'company_name' AS dimension, company_name AS value FROM api_professional
+            UNION ALL SELECT 'job_title' AS dimension, job_title AS value FROM api_professional
+        ) g GROUP BY 1, 2
+        """,
+    ]
+
+
+def forwards(apps, schema_editor):
+    statements = {
+        "sqlite": SQLITE_INSTALL + _count("date(created_at)"),
+        "postgresql": PG_INSTALL + _count("(created_at AT TIME ZONE 'UTC')::date"),
+    }
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    statements = {"sqlite": SQLITE_UNINSTALL, "postgresql": PG_UNINSTALL}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_professional_identity_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfessionalDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('source', models.CharField(choices=[('direct', 'direct'), ('partner', 'partner'), ('internal', 'internal')], max_length=16)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'source'), name='professional_daily_stat_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfessionalGroupStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('company_name', 'company_name'), ('job_title', 'job_title')], max_length=16)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', '-count'], name='professional_group_stat_top')],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value'), name='professional_group_stat_key')],
+            },
+        ),
+        # sync triggers, then counted once from the existing professionals
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+
+# professional_email_ci_unique (on lower(email)) already makes email unique, the case sensitive index
+# was a second unique index to maintain on every write
+
+
+def _email_field(Professional, unique: bool):
+    field = models.EmailField(unique=unique, null=True, blank=True)
+    field.set_attributes_from_name("email")
+    field.model = Professional
+    return field
+
+
+def _alter(apps, schema_editor, unique: bool):
+    Professional = apps.get_model("api", "Professional")
+    table = Professional._meta.db_table
+    triggers = []
+
+    if schema_editor.connection.vendor == "sqlite":
+        # sqlite drops the column's inline unique only by remaking the table, which drops its triggers
+        # (search index and stats sync); put back exactly what was installed
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [table])
+            triggers = [sql for (sql,) in cursor.fetchall()]
+
+    schema_editor.alter_field(Professional, _email_field(Professional, not unique), _email_field(Professional, unique))
+
+    for sql in triggers:
+        schema_editor.execute(sql)
+
+
+def forwards(apps, schema_editor):
+    _alter(apps, schema_editor, unique=False)
+
+
+def backwards(apps, schema_editor):
+    _alter(apps, schema_editor, unique=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0009_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(forwards, backwards)],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="professional",
+                    name="email",
+                    field=models.EmailField(blank=True, max_length=254, null=True),
+                ),
+            ],
+        ),
+    ]
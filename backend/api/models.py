@@ -1,7 +1,33 @@
+import io
+import os
+import re
+
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .services.resume_extractor import summarize_text
 
 
 RESUME_SUMMARY_LENGTH = 40 # no words
+RESUME_CONTENT_DIR = "resumes/sha256/"
+
+
+def normalize_email(value: str | None) -> str | None:
+    # the identity key, `email` keeps the casing it was sent with
+    if not value:
+        return None
+
+    return value.strip().lower() or None
+
+
+def normalize_phone(value: str | None) -> str | None:
+    # stored canonical, digits only, the column itself is the identity key
+    if not value:
+        return None
+
+    return re.sub(r"\D", "", str(value)) or None
+
 
 class Professional(models.Model):
     class Source(models.TextChoices):
@@ -10,7 +36,7 @@ class Professional(models.Model):
         INTERNAL = "internal", "internal"
 
     full_name = models.CharField(max_length=255)
-    email = models.EmailField(unique=True, null=True, blank=True)
+    email = models.EmailField(null=True, blank=True)  # unique case insensitively, see Meta.constraints
     phone = models.CharField(max_length=32, unique=True, null=True, blank=True)
 
     company_name = models.CharField(max_length=255, blank=True, default="")
@@ -19,26 +45,173 @@ class Professional(models.Model):
     source = models.CharField(max_length=16, choices=Source.choices)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination: ?source= filter + (-created_at, -id) ordering is a range scan
+            models.Index(fields=["source", "created_at", "id"], name="professional_source_created"),
+            models.Index(fields=["created_at", "id"], name="professional_created"),
+        ]
+        constraints = [
+            # Jane@X.com and jane@x.com are one person; upserts probe and conflict on this index
+            models.UniqueConstraint(Lower("email"), name="professional_email_ci_unique"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.full_name} ({self.email or self.phone or 'no-email'})"
 
+    def save(self, *args, **kwargs):
+        self.phone = normalize_phone(self.phone)
+        super().save(*args, **kwargs)
+
+
+class ProfessionalDailyStat(models.Model):
+    """
+    signups per utc day and source, kept in step with api_professional by triggers (services.professional_stats)
+    """
+    day = models.DateField()
+    source = models.CharField(max_length=16, choices=Professional.Source.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "source"], name="professional_daily_stat_key"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ProfessionalDailyStat({self.day}, {self.source}={self.count})"
+
+
+class ProfessionalGroupStat(models.Model):
+    """
+    professionals per company / job title, kept in step with api_professional by triggers
+    """
+    class Dimension(models.TextChoices):
+        COMPANY_NAME = "company_name", "company_name"
+        JOB_TITLE = "job_title", "job_title"
+
+    dimension = models.CharField(max_length=16, choices=Dimension.choices)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "value"], name="professional_group_stat_key"),
+        ]
+        indexes = [
+            # top N per dimension is an index range scan
+            models.Index(fields=["dimension", "-count"], name="professional_group_stat_top"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ProfessionalGroupStat({self.dimension}={self.value!r}, {self.count})"
+
+
+def build_resume_summary(text: str) -> str:
+    # line by line, stops after RESUME_SUMMARY_LENGTH words instead of splitting the whole resume
+    return summarize_text(io.StringIO(text or ""), RESUME_SUMMARY_LENGTH)
+
+
+def resume_content_prefix(sha256: str) -> str:
+    return f"{RESUME_CONTENT_DIR}{sha256}."
+
 
 def resume_upload_path(instance: "ResumeUpload", filename: str) -> str:
+    # content addressed once the digest is known: a key only ever holds the bytes it is named after,
+    # resumes with the same content share it and no later upload can overwrite it under them
+    if instance.content_sha256:
+        extension = os.path.splitext(filename)[1].lower() or ".pdf"
+        return f"{resume_content_prefix(instance.content_sha256)}{extension.lstrip('.')}"
+
     # @todo: consider renaming with a professional only bucket
     return f"resumes/professional_{instance.professional_id}/{filename}"
 
 
 class ResumeUpload(models.Model):
+    class ExtractionStatus(models.TextChoices):
+        PENDING = "pending", "pending"
+        PROCESSING = "processing", "processing"
+        DONE = "done", "done"
+        FAILED = "failed", "failed"
+
     professional = models.OneToOneField(Professional, on_delete=models.CASCADE, related_name="resume")
 
     file = models.FileField(upload_to=resume_upload_path)
     extracted_text = models.TextField(blank=True, default="")  # text summary of resume
+    resume_summary = models.TextField(blank=True, default="")  # first RESUME_SUMMARY_LENGTH words, kept in sync on save
+    extraction_status = models.CharField(
+        max_length=16,
+        choices=ExtractionStatus.choices,
+        default=ExtractionStatus.PENDING,
+    )
+    content_sha256 = models.CharField(max_length=64, blank=True, default="", db_index=True)  # dedup key
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
         return f"ResumeUpload(professional_id={self.professional_id})"
 
-    @property
-    def resume_summary(self) -> str:
-        words = (self.extracted_text or "").split()
-        return " ".join(words[:RESUME_SUMMARY_LENGTH])
+    def save(self, *args, **kwargs):
+        # computed once per write of the text, list responses read the column instead of splitting the resume
+        self.resume_summary = build_resume_summary(self.extracted_text)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "extracted_text" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "resume_summary"}
+
+        super().save(*args, **kwargs)
+
+
+class ExtractionJob(models.Model):
+    """
+    db backed queue entry for resume text extraction, drained by `manage.py process_resumes`
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "queued"
+        RUNNING = "running", "running"
+        DONE = "done", "done"
+        FAILED = "failed", "failed"
+
+    resume = models.ForeignKey(ResumeUpload, on_delete=models.CASCADE, related_name="extraction_jobs")
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)  # retries are pushed into the future
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="extractionjob_claim"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ExtractionJob(resume_id={self.resume_id}, status={self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    first response to a POST sent with an Idempotency-Key header, replayed to its retries (services.idempotency)
+    """
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=64)  # the endpoint, the same key sent to another one is another request
+    request_sha256 = models.CharField(max_length=64)
+
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)  # null while in flight
+    response_body = models.TextField(blank=True, default="")  # rendered JSON
+
+    locked_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["key", "scope"], name="idempotency_key_scope"),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"], name="idempotencykey_expires"),
+        ]
+
+    def __str__(self) -> str:
+        return f"IdempotencyKey({self.scope}, {self.key!r}, status={self.response_status})"
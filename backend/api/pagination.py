@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class ProfessionalCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the professionals list
+
+    GET /api/professionals/?limit=50&cursor=<opaque>
+
+    - ordered newest first, id breaks ties for rows created in the same instant
+    - cursors are opaque, so crawlers can page deep without OFFSET scans
+    """
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class AsyncKeysetPagination:
+    """
+    Same ordering and limits as ProfessionalCursorPagination for the async views, forward only
+
+    DRF's paginator evaluates the queryset synchronously, this one pages values() rows with aiterator;
+    the cursor is an opaque urlsafe base64 of the last row's (created_at, id)
+    """
+    page_size = ProfessionalCursorPagination.page_size
+    page_size_query_param = ProfessionalCursorPagination.page_size_query_param
+    max_page_size = ProfessionalCursorPagination.max_page_size
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def decode_cursor(self, request) -> tuple[datetime, int] | None:
+        cursor = request.query_params.get("cursor")
+        if not cursor:
+            return None
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(last_id)
+        except (ValueError, TypeError):
+            raise InvalidCursor("Invalid cursor")
+
+    def encode_cursor(self, row: dict) -> str:
+        raw = json.dumps([row["created_at"].isoformat(), row["id"]]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    async def paginate(self, rows, request) -> tuple[list[dict], str | None]:
+        """
+        rows: a values() queryset with created_at and id, returns the page and the next url
+        """
+        size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        rows = rows.order_by("-created_at", "-id")
+        if position:
+            created_at, last_id = position
+            rows = rows.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id))
+
+        page = [row async for row in rows[:size + 1]]
+
+        next_url = None
+        if len(page) > size:
+            page = page[:size]
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", self.encode_cursor(page[-1]))
+
+        return page, next_url
@@ -1,7 +1,19 @@
-import re
 from rest_framework import serializers
-from .models import Professional, ResumeUpload
+from .models import Professional, ResumeUpload, normalize_phone
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+
+def parse_include_resume(request) -> bool:
+    """
+    the one reading of ?include_resume, every list/search/export path and its queryset must agree on it
+    """
+    if not request:
+        return False
+
+    return str(request.query_params.get("include_resume", "")).strip().lower() == "true"
 
 
 class ProfessionalCreateSerializer(serializers.ModelSerializer):
@@ -23,9 +35,9 @@ class ProfessionalCreateSerializer(serializers.ModelSerializer):
         if not value:
             return value
 
-        digits = re.sub(r"\D", "", str(value))
+        digits = normalize_phone(value)
 
-        if not digits.isdigit():
+        if not digits:
             raise serializers.ValidationError("phone must contain digits only")
 
         if not 7 <= len(digits) <= 15:
@@ -47,9 +59,9 @@ class ProfessionalCreateSerializer(serializers.ModelSerializer):
         if not value:
             return value
 
-        digits = re.sub(r"\D", "", str(value))
+        digits = normalize_phone(value)
 
-        if not digits.isdigit():
+        if not digits:
             raise serializers.ValidationError("phone must contain digits only")
 
         if not 7 <= len(digits) <= 15:
@@ -67,6 +79,20 @@ class ProfessionalCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class ProfessionalBulkItemSerializer(ProfessionalCreateSerializer):
+    """
+    validation only serializer for the bulk upsert engine
+
+    unique validators are dropped (one SELECT per field per row), identities are
+    resolved in batch by services.professional_upsert
+    """
+    class Meta(ProfessionalCreateSerializer.Meta):
+        extra_kwargs = {
+            "email": {"validators": []},
+            "phone": {"validators": []},
+        }
+
+
 class ProfessionalListSerializer(serializers.ModelSerializer):
     resume_url = serializers.SerializerMethodField()
     resume_summary = serializers.SerializerMethodField()
@@ -92,13 +118,27 @@ class ProfessionalListSerializer(serializers.ModelSerializer):
         except ObjectDoesNotExist:
             return None
 
+    @classmethod
+    def get_optimized_queryset(cls, qs, request):
+        """
+        the columns this serializer reads, the resume joined in the same query when it is shown;
+        rows from any other queryset may cost one extra query each
+        """
+        fields = [name for name in cls.Meta.fields if name not in ("resume_url", "resume_summary")]
+
+        if not parse_include_resume(request):
+            return qs.only(*fields)
+
+        return qs.select_related("resume").only(
+            *fields, "resume__id", "resume__professional", "resume__file", "resume__resume_summary",
+        )
+
     def _include_resume(self) -> bool:
-        request = self.context.get("request")
-        if not request:
-            return False
+        # asked twice per row, parsed once per serializer (the child is shared when many=True)
+        if not hasattr(self, "_include_resume_flag"):
+            self._include_resume_flag = parse_include_resume(self.context.get("request"))
 
-        include_resume = request.query_params.get("include_resume", "")
-        return str(include_resume).strip().lower()  == "true"
+        return self._include_resume_flag
 
     def get_resume_url(self, obj: Professional):
         request = self.context.get("request")
@@ -124,8 +164,69 @@ class ProfessionalListSerializer(serializers.ModelSerializer):
         return resume.resume_summary
 
 
+class ProfessionalListValuesSerializer:
+    """
+    Read only fast path for ProfessionalListSerializer, same output byte for byte
+
+    - rows come from values() instead of model instances
+    - include_resume is resolved once per request, not twice per row
+    - every row is built with a single dict literal, no per-field DRF dispatch
+    """
+    columns = [
+        "id",
+        "full_name",
+        "email",
+        "phone",
+        "company_name",
+        "job_title",
+        "source",
+        "created_at",
+    ]
+    resume_columns = ["resume__id", "resume__file", "resume__resume_summary"]
+
+    def __init__(self, request=None):
+        self.request = request
+        self.include_resume = parse_include_resume(request)
+        # same field ProfessionalListSerializer builds for created_at, keeps the iso format identical;
+        # the timezone is bound once instead of a thread local lookup per row
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.format_datetime = serializers.DateTimeField(default_timezone=tz).to_representation
+
+    def values(self, qs):
+        return qs.values(*self.columns, *(self.resume_columns if self.include_resume else []))
+
+    def _resume_url(self, file_name: str | None):
+        if not file_name:
+            return None
+
+        # @todo: this is a quickfix, mirrors ProfessionalListSerializer.get_resume_url
+        url = default_storage.url(file_name).replace("minio", "localhost")
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    def to_representation(self, row: dict) -> dict:
+        created_at = row["created_at"]
+        has_resume = self.include_resume and row["resume__id"] is not None
+
+        return {
+            "id": row["id"],
+            "full_name": row["full_name"],
+            "email": row["email"],
+            "phone": row["phone"],
+            "company_name": row["company_name"],
+            "job_title": row["job_title"],
+            "source": row["source"],
+            "created_at": self.format_datetime(created_at) if created_at is not None else None,
+            "resume_url": self._resume_url(row["resume__file"]) if has_resume else None,
+            "resume_summary": row["resume__resume_summary"] if has_resume else None,
+        }
+
+    def many(self, rows) -> list[dict]:
+        represent = self.to_representation
+        return [represent(row) for row in rows]
+
+
 class ResumeUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = ResumeUpload
-        fields = ["id", "professional", "file", "extracted_text", "created_at"]
-        read_only_fields = ["id", "extracted_text", "created_at"]
+        fields = ["id", "professional", "file", "extracted_text", "resume_summary", "extraction_status", "created_at"]
+        read_only_fields = ["id", "extracted_text", "resume_summary", "extraction_status", "created_at"]
@@ -0,0 +1,111 @@
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+from ..instrumentation import timed
+from ..models import Professional, ResumeUpload, resume_upload_path
+from .extraction_queue import enqueue_extraction
+from .list_cache import bump_list_version
+
+UPLOAD_TOKEN_SALT = "api.resume-direct-upload"
+
+
+class DirectUploadError(ValueError):
+    pass
+
+
+class DirectUploadUnavailable(DirectUploadError):
+    pass
+
+
+def _s3_client():
+    """
+    boto3 client behind django-storages' S3Storage, direct uploads need a bucket to sign against
+    """
+    bucket = getattr(default_storage, "bucket", None)
+    if bucket is None:
+        raise DirectUploadUnavailable("direct uploads require S3 storage (USE_S3=1)")
+
+    return bucket.meta.client, default_storage.bucket_name
+
+
+def _object_key(professional: Professional, filename: str) -> str:
+    # random prefix, two uploads of cv.pdf never overwrite each other before completion
+    name = get_valid_filename(filename or "resume.pdf")
+    return resume_upload_path(ResumeUpload(professional=professional), f"{uuid.uuid4().hex}/{name}")
+
+
+def presign_resume_upload(professional: Professional, filename: str) -> dict:
+    """
+    pre-signed POST for the professional's resume key; the browser sends the file straight to the bucket
+
+    POST rather than PUT: the policy does not sign the host, so the minio -> localhost rewrite keeps it valid
+    """
+    client, bucket_name = _s3_client()
+    key = _object_key(professional, filename)
+    expires_in = settings.RESUME_UPLOAD_URL_EXPIRY
+
+    presigned = client.generate_presigned_post(
+        Bucket=bucket_name,
+        Key=key,
+        Fields={"Content-Type": "application/pdf"},
+        Conditions=[
+            {"Content-Type": "application/pdf"},
+            ["content-length-range", 1, settings.RESUME_MAX_UPLOAD_BYTES],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+    token = signing.dumps({"professional_id": professional.id, "key": key}, salt=UPLOAD_TOKEN_SALT)
+
+    return {
+        # @todo: same quickfix as ProfessionalListSerializer.get_resume_url
+        "url": presigned["url"].replace("minio", "localhost"),
+        "fields": presigned["fields"],
+        "upload_token": token,
+        "expires_in": expires_in,
+    }
+
+
+def complete_resume_upload(professional: Professional, token: str) -> ResumeUpload:
+    """
+    attach an object uploaded with presign_resume_upload and queue its extraction
+
+    the worker downloads, hashes and extracts, no file byte passes through the web process
+    """
+    _s3_client()
+
+    try:
+        # the token outlives the url a little, a slow client may finish the POST right at expiry
+        payload = signing.loads(token or "", salt=UPLOAD_TOKEN_SALT, max_age=settings.RESUME_UPLOAD_URL_EXPIRY * 2)
+    except signing.BadSignature:
+        raise DirectUploadError("invalid or expired upload_token")
+
+    if payload["professional_id"] != professional.id:
+        raise DirectUploadError("upload_token belongs to another professional")
+
+    key = payload["key"]
+    with timed("storage"):
+        exists = default_storage.exists(key)
+
+    if not exists:
+        raise DirectUploadError("uploaded file not found, POST it to the pre-signed url first")
+
+    resume = ResumeUpload.objects.filter(professional=professional).first() or ResumeUpload(professional=professional)
+
+    if resume.id and resume.file.name == key:
+        return resume  # completion retried
+
+    resume.file.name = key
+    resume.content_sha256 = ""  # unknown until the worker reads the object
+    resume.extracted_text = ""
+    resume.extraction_status = ResumeUpload.ExtractionStatus.PENDING
+    resume.save()
+
+    enqueue_extraction(resume)
+    bump_list_version()
+
+    return resume
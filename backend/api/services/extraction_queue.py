@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import ExtractionJob, ResumeUpload
+from .list_cache import bump_list_version
+from .resume_dedup import cache_text, get_cached_text
+from .resume_extractor import extract_text_from_bytes, send_extracted_text
+
+logger = logging.getLogger("api")
+
+CLAIM_CANDIDATES = 10  # rows peeked per claim attempt, others may be taken by sibling workers
+
+
+def enqueue_extraction(resume: ResumeUpload) -> ExtractionJob:
+    """
+    queue text extraction for a stored resume, an already queued job for the same resume is reused
+    """
+    with transaction.atomic():
+        ResumeUpload.objects.filter(id=resume.id).update(extraction_status=ResumeUpload.ExtractionStatus.PENDING)
+        resume.extraction_status = ResumeUpload.ExtractionStatus.PENDING
+
+        job = ExtractionJob.objects.filter(resume=resume, status=ExtractionJob.Status.QUEUED).first()
+        if job:
+            job.attempts = 0
+            job.available_at = timezone.now()
+            job.save(update_fields=["attempts", "available_at", "updated_at"])
+            return job
+
+        return ExtractionJob.objects.create(resume=resume)
+
+
+def _claimable(now) -> Q:
+    # running jobs whose lease expired belong to a worker that died mid job
+    lease = timedelta(seconds=settings.RESUME_EXTRACTION_LEASE)
+
+    return (
+        Q(status=ExtractionJob.Status.QUEUED, available_at__lte=now)
+        | Q(status=ExtractionJob.Status.RUNNING, locked_at__lt=now - lease)
+    )
+
+
+def claim_next_job() -> ExtractionJob | None:
+    """
+    claim the oldest runnable job with a conditional UPDATE, safe across worker processes on sqlite and postgres
+    """
+    now = timezone.now()
+    candidates = list(
+        ExtractionJob.objects.filter(_claimable(now))
+        .order_by("available_at", "id")
+        .values_list("id", flat=True)[:CLAIM_CANDIDATES]
+    )
+
+    for job_id in candidates:
+        claimed = ExtractionJob.objects.filter(_claimable(now), id=job_id).update(
+            status=ExtractionJob.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+
+        if claimed:
+            return ExtractionJob.objects.select_related("resume").get(id=job_id)
+
+    return None
+
+
+def extraction_options() -> dict:
+    return {
+        "max_pages": settings.RESUME_EXTRACTION_MAX_PAGES,
+        "time_limit": settings.RESUME_EXTRACTION_TIME_LIMIT,
+        "workers": settings.RESUME_EXTRACTION_WORKERS,
+    }
+
+
+def _child_context():
+    """
+    never fork the caller: a web worker runs threads (the storage PUT next to this very extraction) and
+    a forked child can inherit a lock boto3, logging or the db driver held at that instant
+
+    forkserver forks from a clean single threaded server with the extractor already imported, so a
+    child starts in milliseconds; spawn where forkserver does not exist
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["api.services.resume_extractor"])
+    return ctx
+
+
+CHILD_CONTEXT = _child_context()
+
+
+def extract_with_timeout(data: bytes, timeout: int, options: dict | None = None) -> str:
+    """
+    run pypdf in a child process so a pathological pdf can be killed, timeout <= 0 runs inline
+    """
+    options = extraction_options() if options is None else options
+
+    if timeout <= 0:
+        return extract_text_from_bytes(data, **options)
+
+    # a plain (non daemon) process, it may start its own page pool when workers > 1
+    receiver, sender = CHILD_CONTEXT.Pipe(duplex=False)
+    process = CHILD_CONTEXT.Process(target=send_extracted_text, args=(sender, data, options))
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            raise multiprocessing.TimeoutError()
+
+        return receiver.recv()
+
+    finally:
+        receiver.close()
+        if process.is_alive():
+            _kill_process_tree(process)  # still spinning on a malformed file
+        process.join()
+
+
+def _kill_process_tree(process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        process.kill()
+
+
+def run_job(job: ExtractionJob, timeout: int | None = None) -> bool:
+    """
+    extract text for a claimed job; failures are retried with backoff until max attempts
+    """
+    timeout = settings.RESUME_EXTRACTION_TIMEOUT if timeout is None else timeout
+    resume = job.resume
+
+    ResumeUpload.objects.filter(id=resume.id).update(extraction_status=ResumeUpload.ExtractionStatus.PROCESSING)
+
+    try:
+        with resume.file.open("rb") as f:
+            data = f.read()
+
+        resume.content_sha256 = resume.content_sha256 or hashlib.sha256(data).hexdigest()
+        extracted = get_cached_text(resume.content_sha256)
+
+        if extracted is None:
+            extracted = extract_with_timeout(data, timeout)
+            cache_text(resume.content_sha256, extracted)
+
+    except multiprocessing.TimeoutError:
+        _retry_or_fail(job, f"extraction timed out after {timeout}s")
+        return False
+
+    except Exception as e:
+        logger.exception("failed to extract stored resume")
+        _retry_or_fail(job, str(e) or repr(e))
+        return False
+
+    with transaction.atomic():
+        resume.extracted_text = extracted
+        resume.extraction_status = ResumeUpload.ExtractionStatus.DONE
+        resume.save(update_fields=["extracted_text", "extraction_status", "content_sha256"])
+
+        job.status = ExtractionJob.Status.DONE
+        job.last_error = ""
+        job.save(update_fields=["status", "last_error", "updated_at"])
+
+    bump_list_version()  # resume_summary is now filled in
+    logger.info("Extracted resume", extra={"resume_id": resume.id, "attempts": job.attempts})
+    return True
+
+
+def _retry_or_fail(job: ExtractionJob, message: str) -> None:
+    exhausted = job.attempts >= settings.RESUME_EXTRACTION_MAX_ATTEMPTS
+
+    logger.warning(
+        "Resume extraction attempt failed",
+        extra={"resume_id": job.resume_id, "attempts": job.attempts, "exhausted": exhausted},
+    )
+
+    with transaction.atomic():
+        if exhausted:
+            job.status = ExtractionJob.Status.FAILED
+            resume_status = ResumeUpload.ExtractionStatus.FAILED
+        else:
+            job.status = ExtractionJob.Status.QUEUED
+            job.available_at = timezone.now() + timedelta(
+                seconds=settings.RESUME_EXTRACTION_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+            resume_status = ResumeUpload.ExtractionStatus.PENDING
+
+        job.last_error = message
+        job.save(update_fields=["status", "available_at", "last_error", "updated_at"])
+        ResumeUpload.objects.filter(id=job.resume_id).update(extraction_status=resume_status)
+
+
+def process_pending_jobs(limit: int | None = None, timeout: int | None = None) -> int:
+    """
+    drain runnable jobs, returns the number processed
+    """
+    processed = 0
+
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if not job:
+            break
+
+        run_job(job, timeout=timeout)
+        processed += 1
+
+    return processed
+
+
+def run_worker(poll_interval: float = 1.0, timeout: int | None = None) -> None:
+    """
+    long running worker loop, one job at a time; run several processes for parallelism
+    """
+    while True:
+        if not process_pending_jobs(timeout=timeout):
+            time.sleep(poll_interval)
@@ -0,0 +1,248 @@
+"""
+Idempotency-Key on POST /api/professionals and /bulk, a retried request gets the first response back
+
+- the first request inserts (key, scope) in flight, the unique constraint decides which one executes
+- 200/201/207 responses are stored rendered and replayed with `Idempotent-Replayed: true`, the upsert
+  does not run again
+- anything else (400, an exception) releases the key, the client can fix the payload and retry
+- a duplicate arriving while the first is in flight waits for it, 409 after IDEMPOTENCY_WAIT_TIMEOUT
+- the same key with another body is a 422; keys expire after IDEMPOTENCY_KEY_TTL
+- an in flight key older than IDEMPOTENCY_LOCK_TIMEOUT (its worker died) is taken over
+"""
+import asyncio
+import hashlib
+import inspect
+import time
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ..models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+REPLAYABLE = {200, 201, 207}
+POLL_MIN = 0.02  # seconds between checks on an in flight key, doubled up to POLL_MAX
+POLL_MAX = 0.5
+
+renderer = JSONRenderer()
+
+
+class IdempotencyError(Exception):
+    def __init__(self, detail: str, status: int, headers: dict | None = None):
+        super().__init__(detail)
+        self.status = status
+        self.headers = headers
+
+
+def _json(data, status: int, headers: dict | None = None) -> HttpResponse:
+    return HttpResponse(renderer.render(data), status=status, headers=headers, content_type="application/json")
+
+
+def _attempt(key: str, scope: str, fingerprint: str) -> tuple[bool, IdempotencyKey | None]:
+    """
+    one try: (True, None) this request executes, (False, record) replay it, (False, None) still in flight
+    """
+    while True:
+        now = timezone.now()
+
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    key=key, scope=scope, request_sha256=fingerprint,
+                    locked_at=now, expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+            return True, None
+        except IntegrityError:
+            pass
+
+        record = IdempotencyKey.objects.filter(key=key, scope=scope).first()
+
+        if record is None:
+            continue  # released in between, claim it again
+
+        if record.expires_at <= now:
+            IdempotencyKey.objects.filter(pk=record.pk, expires_at__lte=now).delete()
+            continue
+
+        if record.request_sha256 != fingerprint:
+            raise IdempotencyError(f"{HEADER} was already used with a different payload.", 422)
+
+        if record.response_status is not None:
+            return False, record
+
+        lease = timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        if record.locked_at > now - lease:
+            return False, None
+
+        # conditional on the lock we saw, one of several waiters takes over
+        taken = IdempotencyKey.objects.filter(
+            pk=record.pk, response_status=None, locked_at=record.locked_at,
+        ).update(locked_at=now)
+        if taken:
+            return True, None
+
+
+def _waits():
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    delay = POLL_MIN
+
+    while (left := deadline - time.monotonic()) > 0:
+        yield min(delay, left)
+        delay = min(delay * 2, POLL_MAX)
+
+
+def _still_in_flight() -> IdempotencyError:
+    return IdempotencyError(
+        f"A request with this {HEADER} is still in progress.", 409, headers={"Retry-After": "1"},
+    )
+
+
+def claim_key(key: str, scope: str, fingerprint: str) -> IdempotencyKey | None:
+    """
+    None when this request owns the key and must execute, otherwise the stored response to replay
+    """
+    waits = _waits()
+
+    while True:
+        owned, record = _attempt(key, scope, fingerprint)
+        if owned or record:
+            return record
+
+        delay = next(waits, None)
+        if delay is None:
+            raise _still_in_flight()
+        time.sleep(delay)
+
+
+async def aclaim_key(key: str, scope: str, fingerprint: str) -> IdempotencyKey | None:
+    # polls with asyncio.sleep, a waiting duplicate holds no thread
+    waits = _waits()
+
+    while True:
+        owned, record = await sync_to_async(_attempt)(key, scope, fingerprint)
+        if owned or record:
+            return record
+
+        delay = next(waits, None)
+        if delay is None:
+            raise _still_in_flight()
+        await asyncio.sleep(delay)
+
+
+def finish_key(key: str, scope: str, status: int, body: bytes) -> None:
+    """
+    store a replayable response, release the key for anything else
+    """
+    pending = IdempotencyKey.objects.filter(key=key, scope=scope, response_status=None)
+
+    if status in REPLAYABLE:
+        pending.update(
+            response_status=status, response_body=body.decode(),
+            expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+        )
+    else:
+        pending.delete()
+
+
+def release_key(key: str, scope: str) -> None:
+    IdempotencyKey.objects.filter(key=key, scope=scope, response_status=None).delete()
+
+
+def purge_expired_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def _key(request) -> str | None:
+    key = request.headers.get(HEADER)
+
+    if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+        raise IdempotencyError(f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.", 400)
+
+    return key
+
+
+def _fingerprint(request) -> str:
+    # the raw body, a retry sends the same bytes
+    return hashlib.sha256(request.body).hexdigest()
+
+
+def _replay(record: IdempotencyKey) -> HttpResponse:
+    return HttpResponse(
+        record.response_body, status=record.response_status,
+        headers={REPLAYED_HEADER: "true"}, content_type="application/json",
+    )
+
+
+def _rendered(response) -> bytes:
+    data = getattr(response, "data", None)  # DRF responses are rendered after the view returns
+    return response.content if data is None else renderer.render(data)
+
+
+def idempotent(scope: str):
+    """
+    decorate a sync APIView or async View post; requests without the header run as before
+
+    the sync and async views of an endpoint share a scope, their responses are the same bytes
+    """
+    def decorator(post):
+        if inspect.iscoroutinefunction(post):
+            @wraps(post)
+            async def async_wrapper(view, request, *args, **kwargs):
+                try:
+                    key = _key(request)
+                    if key is None:
+                        return await post(view, request, *args, **kwargs)
+
+                    record = await aclaim_key(key, scope, _fingerprint(request))
+                except IdempotencyError as e:
+                    return _json({"detail": str(e)}, e.status, e.headers)
+
+                if record is not None:
+                    return _replay(record)
+
+                try:
+                    response = await post(view, request, *args, **kwargs)
+                except BaseException:
+                    await sync_to_async(release_key)(key, scope)
+                    raise
+
+                await sync_to_async(finish_key)(key, scope, response.status_code, _rendered(response))
+                return response
+
+            return async_wrapper
+
+        @wraps(post)
+        def wrapper(view, request, *args, **kwargs):
+            try:
+                key = _key(request)
+                if key is None:
+                    return post(view, request, *args, **kwargs)
+
+                record = claim_key(key, scope, _fingerprint(request))
+            except IdempotencyError as e:
+                return _json({"detail": str(e)}, e.status, e.headers)
+
+            if record is not None:
+                return _replay(record)
+
+            try:
+                response = post(view, request, *args, **kwargs)
+            except BaseException:
+                release_key(key, scope)  # validation errors are raised, DRF turns them into the 400
+                raise
+
+            finish_key(key, scope, response.status_code, _rendered(response))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+LIST_VERSION_KEY = "professionals-list:version"
+LIST_PAGE_PREFIX = "professionals-list:page:"
+
+
+def get_list_version() -> int:
+    """
+    version of the professionals directory, the ns timestamp of the last write
+
+    an evicted version restarts at now, every page cached under the old one becomes unreachable
+    """
+    version = cache.get(LIST_VERSION_KEY)
+
+    if version is None:
+        version = time.time_ns()
+        # add, not set: a concurrent reader must not overwrite a bump that landed in between
+        if not cache.add(LIST_VERSION_KEY, version, timeout=None):
+            version = cache.get(LIST_VERSION_KEY, version)
+
+    return version
+
+
+def bump_list_version() -> int:
+    """
+    call after any write that changes what the list returns, old pages simply age out of the cache
+    """
+    version = time.time_ns()
+    cache.set(LIST_VERSION_KEY, version, timeout=None)
+    return version
+
+
+async def aget_list_version() -> int:
+    version = await cache.aget(LIST_VERSION_KEY)
+
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(LIST_VERSION_KEY, version, timeout=None):
+            version = await cache.aget(LIST_VERSION_KEY, version)
+
+    return version
+
+
+async def abump_list_version() -> int:
+    version = time.time_ns()
+    await cache.aset(LIST_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def _request_fingerprint(request) -> str:
+    # host is part of it, resume urls and next links are absolute
+    params = sorted(request.query_params.lists())
+    raw = f"{request.scheme}://{request.get_host()}{request.path}?{params}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def list_etag(version: int, request) -> str:
+    return quote_etag(f"{version:x}-{_request_fingerprint(request)[:16]}")
+
+
+def list_cache_key(version: int, request) -> str:
+    return f"{LIST_PAGE_PREFIX}{version}:{_request_fingerprint(request)}"
+
+
+def get_cached_page(version: int, request):
+    if not settings.PROFESSIONALS_LIST_CACHE_TTL:
+        return None
+
+    return cache.get(list_cache_key(version, request))
+
+
+def cache_page(version: int, request, data) -> None:
+    if settings.PROFESSIONALS_LIST_CACHE_TTL:
+        cache.set(list_cache_key(version, request), data, timeout=settings.PROFESSIONALS_LIST_CACHE_TTL)
+
+
+async def aget_cached_page(version: int, request):
+    if not settings.PROFESSIONALS_LIST_CACHE_TTL:
+        return None
+
+    return await cache.aget(list_cache_key(version, request))
+
+
+async def acache_page(version: int, request, data) -> None:
+    if settings.PROFESSIONALS_LIST_CACHE_TTL:
+        await cache.aset(list_cache_key(version, request), data, timeout=settings.PROFESSIONALS_LIST_CACHE_TTL)
+
+
+def validator_headers(version: int, request) -> dict:
+    """
+    none while the page cache is off: the version lives in the cache, a per process one (no REDIS_URL)
+    misses the other workers' bumps and would answer 304 for a page that changed
+
+    ETag only, no Last-Modified: its one second granularity would answer If-Modified-Since with a 304
+    after a write in the same second as the response
+    """
+    if not settings.PROFESSIONALS_LIST_CACHE_TTL:
+        return {}
+
+    return {
+        "ETag": list_etag(version, request),
+        "Cache-Control": "no-cache",  # clients may keep it but must revalidate
+    }
+
+
+def not_modified(version: int, request, headers: dict) -> bool:
+    if not headers:
+        return False
+
+    return get_conditional_response(request._request, etag=headers["ETag"]) is not None
@@ -0,0 +1,73 @@
+import csv
+import json
+from typing import Callable, Iterable, Iterator
+
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from rest_framework.utils.encoders import JSONEncoder
+
+EXPORT_CHUNK_SIZE = 2000  # rows per db fetch (server side cursor on postgres)
+LINES_PER_WRITE = 500  # rows joined per chunk handed to the wsgi server
+
+FIELDS = ["id", "full_name", "email", "phone", "company_name", "job_title", "source", "created_at"]
+RESUME_FIELDS = ["resume_url", "resume_summary"]
+
+
+class _Echo:
+    """
+    csv.writer target that hands each formatted line back instead of buffering it
+    """
+    def write(self, value: str) -> str:
+        return value
+
+
+def _iter_rows(qs: QuerySet, include_resume: bool, build_uri: Callable[[str], str] | None) -> Iterator[dict]:
+    """
+    plain dicts straight from values(), no model instances and no serializer
+    """
+    columns = FIELDS + (["resume__file", "resume__resume_summary"] if include_resume else [])
+    encoder = JSONEncoder()
+
+    for row in qs.order_by("id").values(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row["created_at"] = encoder.default(row["created_at"])  # same iso format as the json api
+
+        if include_resume:
+            file_name = row.pop("resume__file")
+            # @todo: same quickfix as ProfessionalListSerializer.get_resume_url
+            url = default_storage.url(file_name).replace("minio", "localhost") if file_name else None
+            row["resume_url"] = build_uri(url) if url and build_uri else url
+            row["resume_summary"] = row.pop("resume__resume_summary")
+
+        yield row
+
+
+def _batched(lines: Iterable[str]) -> Iterator[str]:
+    batch: list[str] = []
+
+    for line in lines:
+        batch.append(line)
+
+        if len(batch) >= LINES_PER_WRITE:
+            yield "".join(batch)
+            batch = []
+
+    if batch:
+        yield "".join(batch)
+
+
+def iter_ndjson(qs: QuerySet, include_resume: bool = False, build_uri=None) -> Iterator[str]:
+    rows = _iter_rows(qs, include_resume, build_uri)
+    return _batched(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def iter_csv(qs: QuerySet, include_resume: bool = False, build_uri=None) -> Iterator[str]:
+    header = FIELDS + (RESUME_FIELDS if include_resume else [])
+    writer = csv.DictWriter(_Echo(), fieldnames=header)
+
+    def lines():
+        yield writer.writeheader()
+
+        for row in _iter_rows(qs, include_resume, build_uri):
+            yield writer.writerow(row)
+
+    return _batched(lines())
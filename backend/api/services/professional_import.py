@@ -0,0 +1,85 @@
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+
+from .professional_upsert import bulk_upsert_professionals
+
+IMPORT_CHUNK_SIZE = 1000  # rows per transaction
+MAX_IMPORT_CHUNK_SIZE = 10000
+
+FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _lines(stream: BinaryIO) -> Iterator[str]:
+    # readline keeps memory bounded to one line, utf-8-sig drops a leading BOM from spreadsheet exports
+    return codecs.iterdecode(iter(stream.readline, b""), "utf-8-sig")
+
+
+def _iter_ndjson(stream: BinaryIO) -> Iterator[tuple[int, object]]:
+    for line_number, line in enumerate(_lines(stream), start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ImportFormatError(f"invalid json: {e}")
+
+
+def _iter_csv(stream: BinaryIO) -> Iterator[tuple[int, object]]:
+    reader = csv.DictReader(_lines(stream))
+
+    for row in reader:
+        # empty cells mean "not provided", an empty email would collide on the unique index
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, object]]:
+    """
+    (line number, record) pairs parsed incrementally, unparsable lines carry an ImportFormatError
+    """
+    if fmt == "ndjson":
+        return _iter_ndjson(stream)
+
+    if fmt == "csv":
+        return _iter_csv(stream)
+
+    raise ImportFormatError(f"format must be one of: {sorted(set(FORMATS.values()))}")
+
+
+def import_records(records: Iterable[tuple[int, object]], chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    upsert records chunk by chunk, one transaction per chunk
+
+    yields one result per input line in order, then a final summary
+    {"summary": true, "lines", "created", "updated", "failed"}
+    """
+    records = iter(records)
+    totals = {"lines": 0, "created": 0, "updated": 0, "failed": 0}
+
+    while chunk := list(islice(records, chunk_size)):
+        parsed = [(line, record) for line, record in chunk if not isinstance(record, ImportFormatError)]
+        outcome = bulk_upsert_professionals([record for _, record in parsed])
+        by_line = {parsed[result["index"]][0]: result for result in outcome["results"]}
+
+        for line, record in chunk:
+            if isinstance(record, ImportFormatError):
+                result = {"status": "failed", "error": str(record)}
+            else:
+                result = {k: v for k, v in by_line[line].items() if k != "index"}
+
+            totals["lines"] += 1
+            totals[result["status"]] += 1
+            yield {"line": line, **result}
+
+    yield {"summary": True, **totals}
@@ -0,0 +1,267 @@
+"""
+Summary tables behind GET /api/professionals/stats, maintained inside the writing transaction
+
+- signups per (utc day, source) and professionals per company / job title
+- sqlite: row triggers; postgres: statement triggers over transition tables, one grouped upsert per
+  statement, so a 500 row bulk upsert or a 20k row COPY touches every counter once
+- counters are upserted in key order, concurrent bulk writers take their row locks in the same order
+- only created_at, source, company_name and job_title matter, other updates leave the counters alone
+- `manage.py rebuild_professional_stats` recomputes both tables should they ever drift
+"""
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+from ..models import ProfessionalDailyStat, ProfessionalGroupStat
+
+DAILY_TABLE = ProfessionalDailyStat._meta.db_table
+GROUP_TABLE = ProfessionalGroupStat._meta.db_table
+DIMENSIONS = [choice.value for choice in ProfessionalGroupStat.Dimension]
+
+
+# --------------------------- sqlite, row triggers
+
+def _sqlite_daily(row: str, delta: int) -> str:
+    return f"""
+        INSERT INTO {DAILY_TABLE} (day, source, count) VALUES (date({row}.created_at), {row}.source, {delta})
+        ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count;
+    """
+
+
+def _sqlite_group(dimension: str, row: str, delta: int) -> str:
+    return f"""
+        INSERT INTO {GROUP_TABLE} (dimension, value, count) VALUES ('{dimension}', {row}.{dimension}, {delta})
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    """
+
+
+SQLITE_INSERT_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_ai AFTER INSERT ON api_professional BEGIN
+        {_sqlite_daily("new", 1)}
+        {"".join(_sqlite_group(dimension, "new", 1) for dimension in DIMENSIONS)}
+    END
+"""
+
+SQLITE_INSTALL = [
+    SQLITE_INSERT_TRIGGER,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_au_daily
+    AFTER UPDATE OF created_at, source ON api_professional
+    WHEN date(old.created_at) IS NOT date(new.created_at) OR old.source IS NOT new.source BEGIN
+        {_sqlite_daily("old", -1)}
+        {_sqlite_daily("new", 1)}
+    END
+    """,
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS api_professional_stats_au_{dimension}
+        AFTER UPDATE OF {dimension} ON api_professional WHEN old.{dimension} IS NOT new.{dimension} BEGIN
+            {_sqlite_group(dimension, "old", -1)}
+            {_sqlite_group(dimension, "new", 1)}
+        END
+        """
+        for dimension in DIMENSIONS
+    ),
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_stats_ad AFTER DELETE ON api_professional BEGIN
+        {_sqlite_daily("old", -1)}
+        {"".join(_sqlite_group(dimension, "old", -1) for dimension in DIMENSIONS)}
+    END
+    """,
+]
+
+SQLITE_DAY = "date(created_at)"
+
+
+# --------------------------- postgres, statement triggers
+
+PG_DAY = "(created_at AT TIME ZONE 'UTC')::date"
+
+
+def _pg_apply(delta: str) -> str:
+    """
+    fold a (created_at, source, company_name, job_title, n) delta into both tables, keys in order
+    """
+    groups = " UNION ALL ".join(
+        f"SELECT '{dimension}' AS dimension, {dimension} AS value, n FROM ({delta}) d" for dimension in DIMENSIONS
+    )
+
+    return f"""
+        INSERT INTO {DAILY_TABLE} (day, source, count)
+        SELECT {PG_DAY}, source, SUM(n) FROM ({delta}) d
+        GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+        ON CONFLICT (day, source) DO UPDATE SET count = {DAILY_TABLE}.count + excluded.count;
+
+        INSERT INTO {GROUP_TABLE} (dimension, value, count)
+        SELECT dimension, value, SUM(n) FROM ({groups}) g
+        GROUP BY 1, 2 HAVING SUM(n) <> 0 ORDER BY 1, 2
+        ON CONFLICT (dimension, value) DO UPDATE SET count = {GROUP_TABLE}.count + excluded.count;
+    """
+
+
+PG_NEW_ROWS = "SELECT created_at, source, company_name, job_title, 1 AS n FROM new_rows"
+PG_OLD_ROWS = "SELECT created_at, source, company_name, job_title, -1 AS n FROM old_rows"
+
+PG_INSTALL = [
+    f"""
+    CREATE OR REPLACE FUNCTION api_professional_stats_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_pg_apply(PG_NEW_ROWS)}
+        ELSIF TG_OP = 'UPDATE' THEN
+            {_pg_apply(f"{PG_NEW_ROWS} UNION ALL {PG_OLD_ROWS}")}
+        ELSE
+            {_pg_apply(PG_OLD_ROWS)}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_stats_ai ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_ai AFTER INSERT ON api_professional
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+    # transition tables rule out a column list, unchanged rows cancel out in the delta instead
+    "DROP TRIGGER IF EXISTS api_professional_stats_au ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_au AFTER UPDATE ON api_professional
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_stats_ad ON api_professional",
+    """
+    CREATE TRIGGER api_professional_stats_ad AFTER DELETE ON api_professional
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION api_professional_stats_sync()
+    """,
+]
+
+
+# --------------------------- both
+
+def _rebuild(day: str) -> list[str]:
+    groups = " UNION ALL ".join(
+        f"SELECT '{dimension}' AS dimension, {dimension} AS value FROM api_professional" for dimension in DIMENSIONS
+    )
+
+    return [
+        f"DELETE FROM {DAILY_TABLE}",
+        f"DELETE FROM {GROUP_TABLE}",
+        f"""
+        INSERT INTO {DAILY_TABLE} (day, source, count)
+        SELECT {day}, source, COUNT(*) FROM api_professional GROUP BY 1, 2
+        """,
+        f"""
+        INSERT INTO {GROUP_TABLE} (dimension, value, count)
+        SELECT dimension, value, COUNT(*) FROM ({groups}) g GROUP BY 1, 2
+        """,
+    ]
+
+
+SQLITE_REBUILD = _rebuild(SQLITE_DAY)  # sqlite has one writer, the transaction already excludes the others
+PG_REBUILD = [
+    # writers wait until commit, a signup between the delete and the recount would be lost
+    "LOCK TABLE api_professional IN SHARE MODE",
+    *_rebuild(PG_DAY),
+]
+
+
+def _statements(vendor: str, sqlite: list[str], postgres: list[str]) -> list[str]:
+    return {"sqlite": sqlite, "postgresql": postgres}.get(vendor, [])
+
+
+def rebuild_stats() -> None:
+    """
+    runtime repair: triggers back in place and both tables recounted in one transaction, readers keep
+    seeing the old counts until it commits
+
+    migrations keep their own frozen copy of this sql; sqlite drops triggers when a migration remakes
+    api_professional, such a migration re-creates them from that copy
+    """
+    statements = _statements(connection.vendor, SQLITE_INSTALL + SQLITE_REBUILD, PG_INSTALL + PG_REBUILD)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+SQLITE_COUNT_NEWER_THAN = [
+    f"""
+    INSERT INTO {DAILY_TABLE} (day, source, count)
+    SELECT {SQLITE_DAY}, source, COUNT(*) FROM api_professional WHERE id > %s GROUP BY 1, 2
+    ON CONFLICT (day, source) DO UPDATE SET count = count + excluded.count
+    """,
+    *(
+        f"""
+        INSERT INTO {GROUP_TABLE} (dimension, value, count)
+        SELECT '{dimension}', {dimension}, COUNT(*) FROM api_professional WHERE id > %s GROUP BY 2
+        ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count
+        """
+        for dimension in DIMENSIONS
+    ),
+]
+
+
+@contextmanager
+def bulk_insert_stats():
+    """
+    count a bulk load of new professionals with grouped upserts on exit instead of three per row
+
+    sqlite only, must run inside transaction.atomic(); postgres statement triggers already count a
+    COPY or multi row INSERT in one pass
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM api_professional")
+        (newest,) = cursor.fetchone()
+        cursor.execute("DROP TRIGGER IF EXISTS api_professional_stats_ai")
+
+    yield
+
+    with connection.cursor() as cursor:
+        for sql in SQLITE_COUNT_NEWER_THAN:
+            cursor.execute(sql, [newest])
+
+        cursor.execute(SQLITE_INSERT_TRIGGER)
+
+
+# --------------------------- queries
+
+def professional_stats(since=None, until=None, source: str | None = None, top: int = 10) -> dict:
+    """
+    read side, O(days x sources + top) rows whatever the number of professionals
+
+    the window and source narrow `by_day`, `by_source` and `total`; top lists are all time
+    """
+    daily = ProfessionalDailyStat.objects.filter(count__gt=0)
+
+    if since:
+        daily = daily.filter(day__gte=since)
+    if until:
+        daily = daily.filter(day__lte=until)
+    if source:
+        daily = daily.filter(source=source)
+
+    by_day = []
+    by_source = {}
+    for day, row_source, count in daily.order_by("day", "source").values_list("day", "source", "count"):
+        by_day.append({"day": day, "source": row_source, "count": count})
+        by_source[row_source] = by_source.get(row_source, 0) + count
+
+    def top_values(dimension: str) -> list[dict]:
+        rows = (
+            ProfessionalGroupStat.objects.filter(dimension=dimension, count__gt=0).exclude(value="")
+            .order_by("-count", "value").values_list("value", "count")[:top]
+        )
+        return [{dimension: value, "count": count} for value, count in rows]
+
+    return {
+        "total": sum(by_source.values()),
+        "by_source": by_source,
+        "by_day": by_day,
+        "top_companies": top_values(ProfessionalGroupStat.Dimension.COMPANY_NAME.value),
+        "top_job_titles": top_values(ProfessionalGroupStat.Dimension.JOB_TITLE.value),
+    }
@@ -0,0 +1,268 @@
+import logging
+from typing import Any, Iterable
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from ..models import Professional, normalize_email
+from ..serializers import ProfessionalBulkItemSerializer, ProfessionalCreateSerializer
+from .list_cache import bump_list_version
+
+logger = logging.getLogger("api")
+
+BULK_BATCH_SIZE = 500  # rows per INSERT/UPDATE statement
+LOOKUP_BATCH_SIZE = 900  # keep IN (...) under sqlite's bound parameter limit
+
+
+def _clean_identity(value: Any) -> str | None:
+    return (str(value or "")).strip() or None
+
+
+def _failed(idx: int, error: str) -> dict:
+    return {"index": idx, "status": "failed", "error": error}
+
+
+def _chunks(values: list, size: int) -> Iterable[list]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _fetch_existing(emails: set[str], phones: set[str]) -> list[Professional]:
+    """
+    resolve every existing row for the payload, one IN query per identity key (batched for large payloads)
+
+    emails are normalized, the lookup runs on lower(email) and probes the case insensitive unique index
+    """
+    rows: dict[int, Professional] = {}
+    by_email = Professional.objects.alias(email_key=Lower("email"))
+
+    for qs, lookup, values in ((by_email, "email_key__in", emails), (Professional.objects, "phone__in", phones)):
+        for batch in _chunks(sorted(values), LOOKUP_BATCH_SIZE):
+            for professional in qs.filter(**{lookup: batch}):
+                rows.setdefault(professional.id, professional)
+
+    return list(rows.values())
+
+
+def _find_existing(data: dict) -> Professional | None:
+    if data.get("email"):
+        return Professional.objects.alias(email_key=Lower("email")).filter(
+            email_key=normalize_email(data["email"]),
+        ).first()
+
+    return Professional.objects.filter(phone=data.get("phone")).first()
+
+
+def upsert_professional(data: dict) -> tuple[Professional, bool]:
+    """
+    Single profile upsert as one statement, race free under concurrent signups
+
+        INSERT .. ON CONFLICT ((LOWER(email))) DO UPDATE SET <provided fields> RETURNING *
+        (phone when email is absent)
+
+    - data is validated (ProfessionalBulkItemSerializer), only provided fields are updated
+    - returns (professional, created); created comes from xmax on postgres, a lookup in the same
+      transaction elsewhere
+    - emails match case insensitively, the stored casing is kept on update
+    - a clash on the other unique column still raises IntegrityError
+    """
+    identity = "email" if data.get("email") else "phone"
+    now = timezone.now()
+
+    # model defaults for omitted fields, the raw insert bypasses them
+    professional = Professional(**data, created_at=now)
+    fields = [f for f in Professional._meta.concrete_fields if not f.primary_key]
+    quote = connection.ops.quote_name
+
+    columns = ", ".join(quote(f.column) for f in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    params = [f.get_db_prep_save(getattr(professional, f.attname), connection) for f in fields]
+
+    updates = [f for f in fields if f.name in data and f.name != identity]
+    # DO UPDATE with nothing to set would not return the row, touch the identity itself
+    assignments = ", ".join(
+        f"{quote(f.column)} = excluded.{quote(f.column)}" for f in updates or [Professional._meta.get_field(identity)]
+    )
+
+    # the arbiter must match the unique index expression exactly
+    target = f"(LOWER({quote('email')}))" if identity == "email" else quote("phone")
+    table = quote(Professional._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+    )
+
+    if connection.vendor == "postgresql":
+        # xmax is 0 on a row version the insert wrote, set on the one ON CONFLICT updated
+        professional = list(Professional.objects.raw(f"{sql} RETURNING *, (xmax = 0) AS inserted", params))[0]
+        created = professional.inserted
+    else:
+        # no xmax: look the identity up first, sqlite write transactions take the lock at BEGIN (immediate)
+        # so no other insert lands between the lookup and ours
+        with transaction.atomic():
+            created = _find_existing(data) is None
+
+            if connection.features.can_return_columns_from_insert:
+                # consumed fully, sqlite finishes the statement only once it is exhausted
+                professional = list(Professional.objects.raw(f"{sql} RETURNING *", params))[0]
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+
+                professional = _find_existing(data)
+
+    bump_list_version()
+    return professional, created
+
+
+def bulk_upsert_professionals(items: list, batch_size: int = BULK_BATCH_SIZE) -> dict:
+    """
+    Set based upsert for a list of profiles
+
+    - upsert by email if present else phone
+    - every item is validated up front, existing rows are resolved with IN queries and
+      writes go out as bulk INSERT / INSERT .. ON CONFLICT DO UPDATE inside one transaction
+    - returns the per-index 207 payload: created/updated/failed counts and results
+    """
+    child = ProfessionalBulkItemSerializer()
+    results: dict[int, dict] = {}
+    valid: list[tuple[int, dict]] = []
+
+    # --------------- validate the whole payload, no db access
+    for idx, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[idx] = _failed(idx, "expected a profile object")
+            continue
+
+        if not _clean_identity(item.get("email")) and not _clean_identity(item.get("phone")):
+            results[idx] = _failed(idx, "either email or phone is required")
+            continue
+
+        try:
+            valid.append((idx, child.run_validation(item)))
+        except serializers.ValidationError as e:
+            results[idx] = _failed(idx, str(e))
+
+    emails = {normalize_email(data["email"]) for _, data in valid if data.get("email")}
+    phones = {data["phone"] for _, data in valid if data.get("phone")}
+
+    try:
+        with transaction.atomic():
+            existing = _fetch_existing(emails, phones)
+            results.update(_apply_batch(valid, existing, batch_size))
+    except IntegrityError:
+        # a concurrent writer claimed one of our identities between the lookup and the write
+        logger.warning("bulk upsert batch conflicted, retrying row by row", extra={"rows": len(valid)})
+        results.update(_upsert_rows_sequentially(valid))
+
+    ordered = [results[idx] for idx in sorted(results)]
+
+    if valid:
+        bump_list_version()
+
+    return {
+        "created": sum(1 for r in ordered if r["status"] == "created"),
+        "updated": sum(1 for r in ordered if r["status"] == "updated"),
+        "failed": sum(1 for r in ordered if r["status"] == "failed"),
+        "results": ordered,
+    }
+
+
+def _apply_batch(valid: list[tuple[int, dict]], existing: list[Professional], batch_size: int) -> dict[int, dict]:
+    """
+    plan every write in memory against the resolved rows, then flush them in bulk
+
+    items are applied in payload order, so a repeated identity updates the row an earlier item created
+    """
+    email_owner = {normalize_email(p.email): p for p in existing if p.email}
+    phone_owner = {p.phone: p for p in existing if p.phone}
+
+    to_create: list[Professional] = []
+    to_update: dict[int, Professional] = {}
+    update_fields: set[str] = set()
+    planned: list[tuple[int, str, Professional]] = []
+    results: dict[int, dict] = {}
+
+    for idx, data in valid:
+        email = normalize_email(data.get("email"))
+        phone = data.get("phone")
+
+        target = email_owner.get(email) if email else phone_owner.get(phone)
+        is_new = target is None
+        target = target or Professional()
+
+        if phone and phone_owner.get(phone) not in (None, target):
+            results[idx] = _failed(idx, "professional with this phone already exists.")
+            continue
+
+        # release identities this item moves away from
+        if target.phone and target.phone != data.get("phone", target.phone) and phone_owner.get(target.phone) is target:
+            del phone_owner[target.phone]
+
+        old_email = normalize_email(target.email)
+        new_email = normalize_email(data.get("email", target.email))
+        if old_email and old_email != new_email and email_owner.get(old_email) is target:
+            del email_owner[old_email]
+
+        for field, value in data.items():
+            # an existing identity keeps the casing it was stored with, like the single upsert
+            if not (field == "email" and not is_new and new_email == old_email):
+                setattr(target, field, value)
+
+        if target.email:
+            email_owner[normalize_email(target.email)] = target
+
+        if target.phone:
+            phone_owner[target.phone] = target
+
+        if is_new:
+            to_create.append(target)
+        elif target.pk is not None:
+            to_update[target.pk] = target
+            update_fields.update(data)
+
+        planned.append((idx, "created" if is_new else "updated", target))
+
+    Professional.objects.bulk_create(to_create, batch_size=batch_size)
+
+    if to_update and update_fields:
+        # native INSERT .. ON CONFLICT (id) DO UPDATE, far cheaper than bulk_update's CASE WHEN per column
+        Professional.objects.bulk_create(
+            list(to_update.values()),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=sorted(update_fields),
+        )
+
+    for idx, outcome, professional in planned:
+        results[idx] = {"index": idx, "status": outcome, "id": professional.id}
+
+    return results
+
+
+def _upsert_rows_sequentially(valid: list[tuple[int, dict]]) -> dict[int, dict]:
+    """
+    slow path, one transaction per row; only used when the batch write hit a unique conflict
+    """
+    results: dict[int, dict] = {}
+
+    for idx, data in valid:
+        try:
+            with transaction.atomic():
+                existing = _find_existing(data)
+
+                serialized = ProfessionalCreateSerializer(instance=existing, data=data)
+                serialized.is_valid(raise_exception=True)
+                professional = serialized.save()
+
+            outcome = "updated" if existing else "created"
+            results[idx] = {"index": idx, "status": outcome, "id": professional.id}
+
+        except Exception as e:
+            logger.exception("bulk upsert item failed")
+            results[idx] = _failed(idx, str(e))
+
+    return results
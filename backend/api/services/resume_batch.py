@@ -0,0 +1,399 @@
+"""
+Bulk resume ingestion: a zip/tar archive (or many uploaded files) plus a manifest mapping file names
+to professionals by id, email or phone
+
+- archive members are read one at a time, a tar stream is never seeked and nothing is unpacked to disk
+- files are handled in batches capped by count and by bytes (BATCH_BYTES, memory per request stays
+  bounded whatever RESUME_MAX_UPLOAD_BYTES is): storage PUTs on threads, text extraction across a
+  process pool, one transaction for the rows of the batch
+- the result is a per manifest row report in the 207 shape of the bulk profile endpoint
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from ..instrumentation import bind_context, timed
+from ..models import (
+    Professional,
+    ResumeUpload,
+    build_resume_summary,
+    normalize_email,
+    normalize_phone,
+    resume_content_prefix,
+)
+from .extraction_queue import enqueue_extraction, extraction_options
+from .list_cache import bump_list_version
+from .resume_dedup import TEXT_CACHE_PREFIX, cache_text
+from .resume_extractor import extract_text_from_bytes
+from .resume_ingest import store_upload
+
+logger = logging.getLogger("api")
+
+BATCH_FILES = 200  # files stored and written per transaction
+BATCH_BYTES = 64 * 1024 * 1024  # and no more than this held in memory at once, whichever comes first
+STORAGE_THREADS = 8
+LOOKUP_BATCH_SIZE = 900  # keep IN (...) under sqlite's bound parameter limit
+IDENTITY_KEYS = ("professional_id", "email", "phone")
+
+Member = tuple[str, int | None, Callable[[], bytes]]  # name, size if known, read()
+
+
+class ResumeBatchError(ValueError):
+    pass
+
+
+# --------------------------- inputs
+
+def _clean_name(name: str) -> str:
+    return name.replace("\\", "/").lstrip("./")
+
+
+def parse_manifest(raw: bytes | str) -> list[dict]:
+    """
+    JSON list of objects or CSV with a header, every row names a `file` and one of professional_id, email, phone
+    """
+    text = raw.decode("utf-8-sig") if isinstance(raw, bytes) else raw
+
+    if text.lstrip().startswith("["):
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise ResumeBatchError(f"invalid manifest json: {e}")
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        raise ResumeBatchError("manifest must list at least one {file, professional_id|email|phone} row")
+
+    return [
+        {key: str(value).strip() for key, value in row.items() if key and value not in ("", None)}
+        for row in rows
+    ]
+
+
+def iter_archive(fileobj: BinaryIO) -> Iterator[Member]:
+    """
+    members of a zip (seekable file) or a tar stream, optionally compressed; read() must be called
+    before the next member is asked for
+    """
+    if fileobj.seekable() and zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.filename, info.file_size, lambda info=info: archive.read(info)
+        return
+
+    if fileobj.seekable():
+        fileobj.seek(0)
+
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile():
+                    yield member.name, member.size, lambda member=member: archive.extractfile(member).read()
+    except tarfile.TarError as e:
+        raise ResumeBatchError(f"archive must be a zip or tar file: {e}")
+
+
+def iter_files(files: Iterable) -> Iterator[Member]:
+    for uploaded in files:
+        yield uploaded.name, uploaded.size, uploaded.read
+
+
+def _read_path(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def iter_directory(root: str) -> Iterator[Member]:
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            yield os.path.relpath(path, root), os.path.getsize(path), lambda path=path: _read_path(path)
+
+
+# --------------------------- ingestion
+
+def _failed(row: dict, error: str) -> dict:
+    return {"index": row["index"], "file": row.get("file"), "status": "failed", "error": error}
+
+
+def _resolve_professionals(rows: list[dict], results: dict[int, dict]) -> None:
+    """
+    sets row["professional_id"] from whichever identity the row carries, a few IN queries for the whole manifest
+    """
+    wanted = {key: set() for key in IDENTITY_KEYS}
+
+    for row in rows:
+        key = next((key for key in IDENTITY_KEYS if row.get(key)), None)
+        if key is None:
+            results[row["index"]] = _failed(row, "manifest row needs professional_id, email or phone")
+            continue
+
+        value = row[key]
+        if key == "phone":
+            value = normalize_phone(value)
+        elif key == "email":
+            value = normalize_email(value)
+        elif not value.isdigit():
+            results[row["index"]] = _failed(row, "professional_id must be an integer")
+            continue
+
+        row["identity"] = (key, int(value) if key == "professional_id" else value)
+        wanted[key].add(row["identity"][1])
+
+    found: dict[tuple, int] = {}
+    qs = Professional.objects.annotate(email_key=Lower("email"))  # probes the case insensitive unique index
+
+    for key, column in (("professional_id", "id"), ("email", "email_key"), ("phone", "phone")):
+        values = sorted(wanted[key])
+
+        for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+            lookup = {f"{column}__in": values[start:start + LOOKUP_BATCH_SIZE]}
+            for professional_id, value in qs.filter(**lookup).values_list("id", column):
+                found[(key, value)] = professional_id
+
+    claimed: set[int] = set()
+    for row in rows:
+        if row["index"] in results:
+            continue
+
+        professional_id = found.get(row["identity"])
+        if professional_id is None:
+            results[row["index"]] = _failed(row, "professional not found")
+        elif professional_id in claimed:
+            results[row["index"]] = _failed(row, "professional already has a file in this upload")
+        else:
+            row["professional_id"] = professional_id
+            claimed.add(professional_id)
+
+
+class _Ingest:
+    def __init__(self, workers: int | None):
+        self.workers = max(workers or settings.RESUME_BATCH_WORKERS, 1)
+        self.pool = None
+        self.options = {**extraction_options(), "workers": 1}  # the pool already runs files side by side
+        self.results: dict[int, dict] = {}
+        self.written = False
+
+    def _extract_async(self, data: bytes):
+        if self.pool is None:
+            # spawn, the web worker runs threads and forking it can deadlock the children
+            self.pool = multiprocessing.get_context("spawn").Pool(self.workers)
+
+        return self.pool.apply_async(extract_text_from_bytes, (data,), self.options)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.terminate()  # a child stuck on a pathological pdf is killed, its file was queued
+            self.pool.join()
+
+    def flush(self, batch: list[tuple[dict, bytes]]) -> None:
+        if not batch:
+            return
+
+        items = [(row, data, hashlib.sha256(data).hexdigest()) for row, data in batch]
+        digests = {sha256 for _, _, sha256 in items}
+
+        professional_ids = [row["professional_id"] for row, _, _ in items]
+        existing = {
+            resume.professional_id: resume
+            for resume in ResumeUpload.objects.filter(professional_id__in=professional_ids).defer("extracted_text")
+        }
+
+        # identical bytes already stored or extracted for anyone: share the object, reuse the text
+        stored: dict[str, str] = {}
+        texts: dict[str, str] = {}
+        for sha256, name, status, text in (
+            ResumeUpload.objects.filter(content_sha256__in=digests).exclude(file="")
+            .values_list("content_sha256", "file", "extraction_status", "extracted_text")
+        ):
+            if name.startswith(resume_content_prefix(sha256)):
+                stored.setdefault(sha256, name)  # only content addressed keys are shared
+            if status == ResumeUpload.ExtractionStatus.DONE:
+                texts.setdefault(sha256, text)
+
+        cached = cache.get_many([TEXT_CACHE_PREFIX + sha256 for sha256 in digests - texts.keys()])
+        texts.update({key[len(TEXT_CACHE_PREFIX):]: text for key, text in cached.items()})
+
+        changed = []
+        for row, data, sha256 in items:
+            resume = existing.get(row["professional_id"])
+
+            if resume and resume.content_sha256 == sha256 and resume.file:
+                self.results[row["index"]] = self._done(row, "unchanged", resume)
+            else:
+                changed.append((row, data, sha256, resume))
+
+        # one extraction and one PUT per distinct content, extraction starts first and overlaps the PUTs
+        extracting = {}
+        uploads = {}
+        for row, data, sha256, _ in changed:
+            if sha256 not in texts and sha256 not in extracting:
+                extracting[sha256] = self._extract_async(data)
+            if sha256 not in stored and sha256 not in uploads:
+                uploads[sha256] = (row, data)
+
+        with ThreadPoolExecutor(max_workers=STORAGE_THREADS) as threads:
+            names = threads.map(bind_context(self._store), uploads.items())
+            stored.update(zip(uploads, names))
+
+        timeout = settings.RESUME_EXTRACTION_TIMEOUT or None
+        with timed("extract"):
+            for sha256, pending in extracting.items():
+                try:
+                    texts[sha256] = pending.get(timeout)
+                    cache_text(sha256, texts[sha256])
+                except multiprocessing.TimeoutError:
+                    logger.warning("batch resume extraction timed out, queueing", extra={"sha256": sha256})
+                except Exception:
+                    logger.exception("batch resume extraction failed, queueing")
+
+        self._write(changed, stored, texts)
+
+    def _store(self, upload: tuple[str, tuple[dict, bytes]]) -> str:
+        sha256, (row, data) = upload
+        resume = ResumeUpload(professional_id=row["professional_id"], content_sha256=sha256)
+        return store_upload(resume, ContentFile(data, name=os.path.basename(row["file"])))
+
+    def _write(self, changed: list, stored: dict[str, str], texts: dict[str, str]) -> None:
+        to_create: list[ResumeUpload] = []
+        to_update: list[ResumeUpload] = []
+        outcomes: list[tuple[dict, str, ResumeUpload]] = []
+
+        for row, _, sha256, resume in changed:
+            text = texts.get(sha256)
+            target = resume or ResumeUpload(professional_id=row["professional_id"])
+
+            target.file.name = stored[sha256]
+            target.content_sha256 = sha256
+            target.extracted_text = text or ""
+            target.resume_summary = build_resume_summary(target.extracted_text)  # bulk writes skip save()
+            target.extraction_status = (
+                ResumeUpload.ExtractionStatus.DONE if text is not None else ResumeUpload.ExtractionStatus.PENDING
+            )
+
+            (to_update if resume else to_create).append(target)
+            outcomes.append((row, "updated" if resume else "created", target))
+
+        with transaction.atomic():
+            ResumeUpload.objects.bulk_create(to_create)
+            ResumeUpload.objects.bulk_update(
+                to_update, ["file", "content_sha256", "extracted_text", "resume_summary", "extraction_status"],
+            )
+
+            for row, outcome, resume in outcomes:
+                if resume.extraction_status == ResumeUpload.ExtractionStatus.PENDING:
+                    enqueue_extraction(resume)
+
+                self.results[row["index"]] = self._done(row, outcome, resume)
+
+        self.written = self.written or bool(outcomes)
+
+    def _done(self, row: dict, outcome: str, resume: ResumeUpload) -> dict:
+        return {
+            "index": row["index"],
+            "file": row["file"],
+            "status": outcome,
+            "professional_id": row["professional_id"],
+            "resume_id": resume.id,
+            "extraction_status": resume.extraction_status,
+        }
+
+
+def ingest_resumes(
+    members: Iterable[Member],
+    manifest: list[dict],
+    workers: int | None = None,
+    batch_files: int = BATCH_FILES,
+    batch_bytes: int = BATCH_BYTES,
+) -> dict:
+    """
+    Attach every manifest file found among members to its professional
+
+    - a re-sent identical file is `unchanged`, otherwise the resume is `created` or `updated`
+    - extraction_status is `done`, or `pending` when extraction timed out or failed (queued for the worker)
+    - files the manifest does not list are skipped
+    """
+    rows = [{**row, "index": index} for index, row in enumerate(manifest)]
+    ingest = _Ingest(workers)
+    results = ingest.results
+
+    by_name: dict[str, dict] = {}
+    for row in rows:
+        if not row.get("file"):
+            results[row["index"]] = _failed(row, "manifest row needs a file")
+        elif _clean_name(row["file"]) in by_name:
+            results[row["index"]] = _failed(row, "file listed more than once")
+        else:
+            by_name[_clean_name(row["file"])] = row
+
+    _resolve_professionals([row for row in rows if row["index"] not in results], results)
+
+    max_bytes = settings.RESUME_MAX_UPLOAD_BYTES
+    seen: set[int] = set()
+    skipped = 0
+    batch: list[tuple[dict, bytes]] = []
+    held = 0  # bytes in batch
+
+    try:
+        for name, size, read in members:
+            row = by_name.get(_clean_name(name))
+            if row is None:
+                skipped += 1
+                continue
+
+            seen.add(row["index"])
+            if row["index"] in results:
+                continue
+
+            data = read() if size is None or size <= max_bytes else None
+            if data is None or len(data) > max_bytes:
+                results[row["index"]] = _failed(row, f"file is larger than {max_bytes} bytes")
+                continue
+
+            batch.append((row, data))
+            held += len(data)
+            if len(batch) >= batch_files or held >= batch_bytes:
+                ingest.flush(batch)
+                batch = []
+                held = 0
+
+        ingest.flush(batch)
+    finally:
+        ingest.close()
+
+    for row in by_name.values():
+        if row["index"] not in seen and row["index"] not in results:
+            results[row["index"]] = _failed(row, "file not found in upload")
+
+    if ingest.written:
+        bump_list_version()  # resume_url / resume_summary changed
+
+    ordered = [results[index] for index in sorted(results)]
+    counts = {
+        status: sum(1 for r in ordered if r["status"] == status)
+        for status in ("created", "updated", "unchanged", "failed")
+    }
+
+    return {
+        **counts,
+        "queued": sum(1 for r in ordered if r.get("extraction_status") == ResumeUpload.ExtractionStatus.PENDING),
+        "skipped": skipped,
+        "results": ordered,
+    }
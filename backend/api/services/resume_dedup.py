@@ -0,0 +1,133 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadhandler import FileUploadHandler
+
+from ..models import ResumeUpload, resume_content_prefix
+
+TEXT_CACHE_PREFIX = "resume-text:"
+
+
+class Sha256UploadHandler(FileUploadHandler):
+    """
+    hashes every uploaded file while the multipart body streams in, chunks are passed on untouched
+
+    digests land on request.upload_sha256 keyed by field name
+    """
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digest = None
+
+        if request is not None and not hasattr(request, "upload_sha256"):
+            request.upload_sha256 = {}
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.request is not None:
+            self.request.upload_sha256[self.field_name] = self.digest.hexdigest()
+
+        return None  # let the next handler build the file object
+
+
+def sha256_of(uploaded) -> str:
+    """
+    fallback for files that did not come through Sha256UploadHandler
+    """
+    digest = hashlib.sha256()
+
+    for chunk in uploaded.chunks():
+        digest.update(chunk)
+
+    uploaded.seek(0)
+    return digest.hexdigest()
+
+
+def get_cached_text(sha256: str) -> str | None:
+    """
+    extracted text for already seen content, cache first then any finished resume with the same digest
+    """
+    if not sha256:
+        return None
+
+    text = cache.get(TEXT_CACHE_PREFIX + sha256)
+    if text is not None:
+        return text
+
+    text = (
+        ResumeUpload.objects.filter(content_sha256=sha256, extraction_status=ResumeUpload.ExtractionStatus.DONE)
+        .values_list("extracted_text", flat=True)
+        .first()
+    )
+
+    if text is not None:
+        cache_text(sha256, text)
+
+    return text
+
+
+async def aget_cached_text(sha256: str) -> str | None:
+    if not sha256:
+        return None
+
+    text = await cache.aget(TEXT_CACHE_PREFIX + sha256)
+    if text is not None:
+        return text
+
+    text = await (
+        ResumeUpload.objects.filter(content_sha256=sha256, extraction_status=ResumeUpload.ExtractionStatus.DONE)
+        .values_list("extracted_text", flat=True)
+        .afirst()
+    )
+
+    if text is not None:
+        await acache_text(sha256, text)
+
+    return text
+
+
+def cache_text(sha256: str, text: str) -> None:
+    if sha256:
+        cache.set(TEXT_CACHE_PREFIX + sha256, text, timeout=settings.RESUME_TEXT_CACHE_TTL)
+
+
+async def acache_text(sha256: str, text: str) -> None:
+    if sha256:
+        await cache.aset(TEXT_CACHE_PREFIX + sha256, text, timeout=settings.RESUME_TEXT_CACHE_TTL)
+
+
+def find_stored_twin(sha256: str, exclude_id: int | None = None) -> ResumeUpload | None:
+    """
+    another resume stored under the content addressed key of these bytes, the key can be shared
+
+    keys under a professional's prefix (older uploads, direct uploads) are never shared, their owner
+    may overwrite them
+    """
+    if not sha256:
+        return None
+
+    return (
+        ResumeUpload.objects.filter(content_sha256=sha256, file__startswith=resume_content_prefix(sha256))
+        .exclude(id=exclude_id)
+        .only("id", "file")
+        .first()
+    )
+
+
+async def afind_stored_twin(sha256: str, exclude_id: int | None = None) -> ResumeUpload | None:
+    if not sha256:
+        return None
+
+    return await (
+        ResumeUpload.objects.filter(content_sha256=sha256, file__startswith=resume_content_prefix(sha256))
+        .exclude(id=exclude_id)
+        .only("id", "file")
+        .afirst()
+    )
@@ -1,26 +1,158 @@
+import io
 import logging
-from typing import BinaryIO
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
 from pypdf import PdfReader
 
 logger = logging.getLogger("api")
 
+DEFAULT_MAX_PAGES = 50  # a resume past this is noise, not signal
+PARALLEL_MIN_PAGES = 16  # below this the process pool costs more than it saves
+MIN_PAGES_PER_TASK = 4
 
-def extract_text_from_pdf(file_obj: BinaryIO) -> str:
+
+def iter_pdf_text(
+    file_obj: BinaryIO,
+    max_pages: int | None = DEFAULT_MAX_PAGES,
+    time_limit: float | None = None,
+) -> Iterator[str]:
     """
-    Extracts text from a pdf resume, can extend to other file types
+    Yields the stripped text of each non-empty page, stops at max_pages or once time_limit seconds have passed
+    """
+    reader = PdfReader(file_obj)
+    deadline = time.time() + time_limit if time_limit else None
+
+    yield from _iter_pages(reader, 0, max_pages, deadline)
+
+
+def _iter_pages(reader: PdfReader, start: int, stop: int | None, deadline: float | None) -> Iterator[str]:
+    for number, page in enumerate(islice(reader.pages, start, stop), start=start):
+        if deadline and time.time() > deadline:
+            logger.warning("PDF extraction hit its time limit", extra={"page": number})
+            return
+
+        text = (page.extract_text() or "").strip()
+
+        if text:
+            yield text
+
+
+def _extract_page_range(data: bytes, start: int, stop: int, deadline: float | None) -> list[str]:
+    """
+    process pool task, every worker parses its own reader over the shared bytes
     """
+    return list(_iter_pages(PdfReader(io.BytesIO(data)), start, stop, deadline))
+
+
+def iter_pdf_text_parallel(
+    data: bytes,
+    workers: int,
+    max_pages: int | None = DEFAULT_MAX_PAGES,
+    time_limit: float | None = None,
+) -> Iterator[str]:
+    """
+    Splits the page range of a large pdf across a process pool, pages are still yielded in document order
+
+    time_limit is checked between pages: past it the text so far is returned without waiting, but a range
+    stuck inside one page keeps its worker busy until extract_with_timeout kills the child's process group
+    """
+    page_count = len(PdfReader(io.BytesIO(data)).pages)
+    page_count = min(page_count, max_pages) if max_pages else page_count
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        yield from iter_pdf_text(io.BytesIO(data), max_pages=max_pages, time_limit=time_limit)
+        return
+
+    deadline = time.time() + time_limit if time_limit else None
+    per_task = max(MIN_PAGES_PER_TASK, math.ceil(page_count / (workers * 2)))
+    # spawn, forking from a process that already runs threads (the pool's own manager) can deadlock the children
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    expired = False
+
     try:
-        reader = PdfReader(file_obj)
-        parts: list[str] = []
+        futures = [
+            pool.submit(_extract_page_range, data, start, min(start + per_task, page_count), deadline)
+            for start in range(0, page_count, per_task)
+        ]
+
+        for future in futures:
+            remaining = deadline - time.time() if deadline else None
+
+            try:
+                yield from future.result(timeout=max(remaining, 0) if remaining is not None else None)
+            except FutureTimeoutError:
+                logger.warning("PDF extraction hit its time limit", extra={"pages": page_count})
+                expired = True
+                return
 
-        for page in reader.pages:
-            text = page.extract_text() or ""
+    finally:
+        # the consumer may stop early (summary), drop ranges nobody will read; running ones stop at the
+        # deadline, unless a single page holds them past it, then they are not waited for
+        pool.shutdown(wait=not expired, cancel_futures=True)
 
-            if text.strip():
-                parts.append(text.strip())
+
+def summarize_text(parts: Iterable[str], max_words: int) -> str:
+    """
+    First max_words words of a stream of text (pdf pages, lines of a stored resume), stops consuming as
+    soon as it has enough; build_resume_summary uses it for every resume_summary write
+    """
+    words: list[str] = []
+
+    for part in parts:
+        words.extend(part.split()[:max_words - len(words)])
+
+        if len(words) >= max_words:
+            break
+
+    return " ".join(words)
+
+
+def extract_text_from_pdf(
+    file_obj: BinaryIO,
+    max_pages: int | None = DEFAULT_MAX_PAGES,
+    time_limit: float | None = None,
+    workers: int = 1,
+) -> str:
+    """
+    Extracts text from a pdf resume, can extend to other file types
+
+    workers > 1 spreads the pages of large documents across a process pool
+    """
+    try:
+        if workers > 1:
+            parts = iter_pdf_text_parallel(file_obj.read(), workers, max_pages=max_pages, time_limit=time_limit)
+        else:
+            parts = iter_pdf_text(file_obj, max_pages=max_pages, time_limit=time_limit)
 
         return "\n\n".join(parts).strip()
 
     except Exception: # @todo: consider using a custom exception
         logger.exception("Failed to extract text from PDF")
         return ""
+
+
+def extract_text_from_bytes(data: bytes, **options) -> str:
+    """
+    picklable entry point for running extraction in a child process
+    """
+    return extract_text_from_pdf(io.BytesIO(data), **options)
+
+
+def send_extracted_text(conn, data: bytes, options: dict) -> None:
+    """
+    child process target, ships the text back over a pipe
+
+    runs in its own process group so a timeout can kill its page pool along with it
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    try:
+        conn.send(extract_text_from_bytes(data, **options))
+    finally:
+        conn.close()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from ..instrumentation import bind_context, timed
+from ..models import ResumeUpload
+from .extraction_queue import extract_with_timeout, extraction_options
+
+logger = logging.getLogger("api")
+
+
+def store_upload(resume: ResumeUpload, upload) -> str:
+    """
+    what FieldFile.save does minus the model save, the row is written once by the caller
+
+    with content_sha256 set the key is content addressed and written at most once
+    """
+    field = resume.file.field
+    storage = resume.file.storage
+    name = field.generate_filename(resume, upload.name)
+
+    with timed("storage"):
+        if resume.content_sha256 and storage.exists(name):
+            return name  # already holds these bytes
+
+        return storage.save(name, upload, max_length=field.max_length)
+
+
+def wants_inline_extraction(upload) -> bool:
+    limit = settings.RESUME_INLINE_EXTRACTION_MAX_BYTES
+    return bool(limit) and upload.size is not None and upload.size <= limit
+
+
+def store_and_extract(resume: ResumeUpload, upload, store: bool = True, extract: bool = True) -> str | None:
+    """
+    storage PUT and text extraction side by side on the bytes already in hand, never re-read from storage
+
+    - the PUT runs on a thread (network bound), extraction in a killable child process (cpu bound)
+    - resume.file.name is set once the object is stored, the row itself is not written here
+    - returns the text, None if extraction was not asked for or ran out of time (queue it instead)
+    """
+    data = upload.read() if extract else None
+    upload.seek(0)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        stored = pool.submit(bind_context(store_upload), resume, upload) if store else None
+        text = _extract_inline(data, upload.size) if extract else None
+
+        if stored:
+            resume.file.name = stored.result()
+
+    return text
+
+
+async def astore_and_extract(resume: ResumeUpload, upload, store: bool = True, extract: bool = True) -> str | None:
+    """
+    store_and_extract for async views, both legs run off the event loop and are awaited together
+    """
+    data = upload.read() if extract else None
+    upload.seek(0)
+
+    async def skipped():
+        return None
+
+    # thread_sensitive=False: storage and extraction must not queue behind the single sync thread
+    name, text = await asyncio.gather(
+        sync_to_async(store_upload, thread_sensitive=False)(resume, upload) if store else skipped(),
+        sync_to_async(_extract_inline, thread_sensitive=False)(data, upload.size) if extract else skipped(),
+    )
+
+    if name:
+        resume.file.name = name
+
+    return text
+
+
+def _extract_inline(data: bytes, size: int | None) -> str | None:
+    try:
+        # small files only, the page pool is not worth its startup here
+        with timed("extract"):
+            return extract_with_timeout(
+                data, settings.RESUME_INLINE_EXTRACTION_TIMEOUT, {**extraction_options(), "workers": 1},
+            )
+    except multiprocessing.TimeoutError:
+        logger.warning("inline resume extraction timed out, queueing", extra={"size": size})
+        return None
+    except EOFError:
+        # the child died without an answer (oom killed, crashed), the worker gets another go at it
+        logger.warning("inline resume extraction process died, queueing", extra={"size": size})
+        return None
@@ -0,0 +1,167 @@
+"""
+Recompute extracted_text for resumes already in storage, after the extractor or pypdf changed
+
+- resumes are walked in id ordered chunks, a checkpoint is the last id written
+- stored objects are read on a bounded thread pool and handed to a process pool as soon as they arrive
+- shared objects and identical bytes are read and extracted once per chunk
+- a failed or timed out extraction leaves the row as it was
+- a row whose file changed while its chunk was extracted (a re-upload) is not written
+"""
+import hashlib
+import logging
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import QuerySet
+
+from ..models import ResumeUpload, build_resume_summary
+from .extraction_queue import extraction_options
+from .resume_dedup import cache_text
+from .resume_extractor import extract_text_from_bytes
+
+logger = logging.getLogger("api")
+
+CHUNK_SIZE = 200  # resumes per chunk, their bytes are in memory at once and written in one bulk_update
+IO_THREADS = 16
+UPDATE_FIELDS = ["extracted_text", "resume_summary", "extraction_status", "content_sha256"]
+
+
+def reextract_queryset(since: datetime | None = None, source: str | None = None) -> QuerySet:
+    qs = ResumeUpload.objects.exclude(file="")
+
+    if since:
+        qs = qs.filter(created_at__gte=since)
+
+    if source:
+        qs = qs.filter(professional__source=source)
+
+    return qs
+
+
+def _read(name: str) -> bytes:
+    with default_storage.open(name, "rb") as f:
+        return f.read()
+
+
+class Reextractor:
+    """
+    one thread pool and one process pool for the whole run, use as a context manager
+    """
+    def __init__(self, workers: int | None = None, io_threads: int = IO_THREADS, timeout: float | None = None):
+        self.workers = max(workers or settings.RESUME_BATCH_WORKERS, 1)
+        self.io_threads = max(io_threads, 1)
+        self.timeout = (settings.RESUME_EXTRACTION_TIMEOUT if timeout is None else timeout) or None
+        self.options = {**extraction_options(), "workers": 1}  # parallel across files, not pages
+        self.pool = None
+        self.threads = None
+
+    def __enter__(self):
+        self.threads = ThreadPoolExecutor(max_workers=self.io_threads)
+        return self
+
+    def __exit__(self, *exc):
+        self.threads.shutdown(wait=True)
+        self._close_pool()
+
+    def _close_pool(self) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def _extract_async(self, data: bytes):
+        if self.pool is None:
+            # spawn, forking a process that holds db connections and threads is not safe
+            self.pool = multiprocessing.get_context("spawn").Pool(self.workers)
+
+        return self.pool.apply_async(extract_text_from_bytes, (data,), self.options)
+
+    def run_chunk(self, resumes: list[ResumeUpload]) -> dict:
+        """
+        re-extract one chunk and write it back, returns updated/unchanged/replaced/failed counts and the failures
+        """
+        by_name: dict[str, list[ResumeUpload]] = defaultdict(list)
+        for resume in resumes:
+            by_name[resume.file.name].append(resume)
+
+        digests: dict[str, str] = {}  # file name -> sha256
+        extracting = {}  # sha256 -> AsyncResult
+        failures: dict[int, str] = {}
+
+        reads = {self.threads.submit(_read, name): name for name in by_name}
+        for future in as_completed(reads):
+            name = reads[future]
+
+            try:
+                data = future.result()
+            except Exception as e:
+                failures.update({resume.id: f"cannot read {name}: {e}" for resume in by_name[name]})
+                continue
+
+            digests[name] = sha256 = hashlib.sha256(data).hexdigest()
+            if sha256 not in extracting:
+                extracting[sha256] = self._extract_async(data)
+
+        texts: dict[str, str] = {}
+        stuck = False
+        for sha256, pending in extracting.items():
+            try:
+                texts[sha256] = pending.get(self.timeout)
+            except multiprocessing.TimeoutError:
+                stuck = True
+                texts[sha256] = None
+            except Exception as e:
+                logger.warning("resume re-extraction failed", extra={"sha256": sha256, "error": str(e)})
+                texts[sha256] = None
+
+        if stuck:
+            self._close_pool()  # its workers may be spinning on a pathological pdf, start fresh next chunk
+
+        changed = []
+        unchanged = 0
+        for resume in resumes:
+            if resume.id in failures:
+                continue
+
+            sha256 = digests[resume.file.name]
+            text = texts[sha256]
+
+            if text is None:
+                failures[resume.id] = "extraction failed or timed out"
+            elif (
+                text == resume.extracted_text and resume.content_sha256 == sha256
+                and resume.extraction_status == ResumeUpload.ExtractionStatus.DONE
+            ):
+                unchanged += 1
+            else:
+                resume.extracted_text = text
+                resume.resume_summary = build_resume_summary(text)  # bulk_update skips save()
+                resume.content_sha256 = sha256
+                resume.extraction_status = ResumeUpload.ExtractionStatus.DONE
+                changed.append(resume)
+
+        with transaction.atomic():
+            # a resume re-uploaded since the chunk was read belongs to its own upload now, ours is older text
+            current = dict(
+                ResumeUpload.objects.select_for_update()
+                .filter(id__in=[resume.id for resume in changed])
+                .values_list("id", "file")
+            )
+            replaced = sum(current.get(resume.id) != resume.file.name for resume in changed)
+            changed = [resume for resume in changed if current.get(resume.id) == resume.file.name]
+
+            ResumeUpload.objects.bulk_update(changed, UPDATE_FIELDS)
+
+        for sha256, text in texts.items():
+            if text is not None:
+                cache_text(sha256, text)  # the cache must not hand the old extractor's text to new uploads
+
+        return {
+            "updated": len(changed), "unchanged": unchanged, "replaced": replaced, "failed": len(failures),
+            "failures": failures,
+        }
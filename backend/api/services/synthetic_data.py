@@ -0,0 +1,129 @@
+"""
+Deterministic synthetic data for benchmarks and local load: same seed, same bytes
+"""
+import random
+
+WORDS = (
+    "clinical research biomedical data analysis regulatory trials oncology genomics cardiology "
+    "laboratory protocol statistics python epidemiology pharmacology compliance operations strategy "
+    "managed led designed published mentored launched reduced improved coordinated reviewed"
+).split()
+
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(lines: list[str]) -> bytes:
+    ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+    ops += [f"({_escape(line)}) '" for line in lines]
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def resume_pdf(seed: int, pages: int = 1) -> bytes:
+    """
+    a text-only PDF of `pages` pages, small and fast to build; pypdf extracts every line back
+    """
+    rng = random.Random(seed)
+    streams = [
+        _page_stream([" ".join(rng.choices(WORDS, k=WORDS_PER_LINE)) for _ in range(LINES_PER_PAGE)])
+        for _ in range(pages)
+    ]
+
+    # objects: 1 catalog, 2 pages, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    for page_id, stream in zip(page_ids, streams):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    return bytes(out)
+
+
+FIRST_NAMES = (
+    "Avery Jordan Taylor Morgan Riley Casey Quinn Jamie Rowan Emerson Harper Skyler Dakota Reese Amara Mateo "
+    "Priya Wei Fatima Diego Hana Lukas Sofia Omar Ingrid Kenji Aisha Noah Elena Tomas Yara Arjun Chloe Malik"
+).split()
+LAST_NAMES = (
+    "Smith Johnson Lee Garcia Patel Nguyen Brown Kim Martin Lopez Clark Young Walker Hall Okafor Rossi Silva "
+    "Schmidt Tanaka Haddad Novak Cohen Singh Murphy Dubois Jensen Ivanova Moreno Chen Alvarez Hughes Costa"
+).split()
+DOMAINS = ("example.com", "example.org", "mail.example.net", "research.example.edu")
+COMPANIES = (
+    "Acme Health", "Wellness Partners", "Internal Ops", "Northwind Labs", "Helix Bio", "Summit Clinical",
+    "Bluebird Pharma", "Meridian Diagnostics", "Oak Street Hospital", "Vertex Analytics", "",
+)
+JOB_TITLES = (
+    "Biomedical Researcher", "Environmental Scientist", "Clinical Research Coordinator", "Data Scientist",
+    "Regulatory Affairs Manager", "Epidemiologist", "Principal Investigator", "Lab Technician",
+    "Biostatistician", "Medical Science Liaison", "",
+)
+SOURCES = ("direct",) * 10 + ("partner",) * 7 + ("internal",) * 3  # weighted 50/35/15
+
+MASK64 = (1 << 64) - 1
+
+
+def mix(seed: int, index: int) -> int:
+    """
+    splitmix64 of (seed, index): a random looking 64 bit value per row without a Random() per row,
+    so any worker can build any index range and get the same rows
+    """
+    z = (seed * 0xD1B54A32D192ED03 + (index + 1) * 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def phone(index: int) -> str:
+    # the row's identity, unique per index whatever the seed
+    return f"555{index:07d}"
+
+
+def professional(index: int, seed: int = 0) -> dict:
+    """
+    fields of the index-th synthetic professional; email and phone are unique per index
+    """
+    bits = mix(seed, index)
+    first = FIRST_NAMES[bits % len(FIRST_NAMES)]
+    last = LAST_NAMES[(bits >> 8) % len(LAST_NAMES)]
+
+    return {
+        "full_name": f"{first} {last}",
+        "email": f"{first}.{last}.{index}@{DOMAINS[(bits >> 16) % len(DOMAINS)]}".lower(),
+        "phone": phone(index),
+        "company_name": COMPANIES[(bits >> 24) % len(COMPANIES)],
+        "job_title": JOB_TITLES[(bits >> 32) % len(JOB_TITLES)],
+        "source": SOURCES[(bits >> 40) % len(SOURCES)],
+    }
+
+
+def has_resume(index: int, seed: int, ratio: float) -> bool:
+    return (mix(seed, index) >> 48) / (1 << 16) < ratio
+
+
+def resume_template(index: int, seed: int, templates: int) -> int:
+    return mix(seed + 1, index) % templates
@@ -1,9 +1,35 @@
 from django.urls import path
-from .views import ProfessionalsView, ProfessionalsBulkUpsertView, ResumeUploadView
+from django.views.decorators.csrf import csrf_exempt
+
+from .async_views import AsyncProfessionalsBulkUpsertView, AsyncProfessionalsView, AsyncResumeUploadView
+from .views import (
+    ProfessionalsBulkUpsertView,
+    ProfessionalsExportView,
+    ProfessionalsImportView,
+    ProfessionalsSearchView,
+    ProfessionalsStatsView,
+    ProfessionalsView,
+    ResumeBulkUploadView,
+    ResumeUploadCompleteView,
+    ResumeUploadUrlView,
+    ResumeUploadView,
+)
 
 urlpatterns = [
     path("professionals/", ProfessionalsView.as_view()),
     path("professionals", ProfessionalsView.as_view()),
     path("professionals/bulk", ProfessionalsBulkUpsertView.as_view()),
+    path("professionals/import", ProfessionalsImportView.as_view()),
+    path("professionals/resumes/bulk", ResumeBulkUploadView.as_view()),
+    path("professionals/search", ProfessionalsSearchView.as_view()),
+    path("professionals/stats", ProfessionalsStatsView.as_view()),
+    path("professionals/export.<str:fmt>", ProfessionalsExportView.as_view()),
     path("professionals/<int:professional_id>/resume", ResumeUploadView.as_view()),
+    path("professionals/<int:professional_id>/resume/upload-url", ResumeUploadUrlView.as_view()),
+    path("professionals/<int:professional_id>/resume/complete", ResumeUploadCompleteView.as_view()),
+
+    # async (asgi) versions, csrf exempt like every APIView above
+    path("async/professionals/", csrf_exempt(AsyncProfessionalsView.as_view())),
+    path("async/professionals/bulk", csrf_exempt(AsyncProfessionalsBulkUpsertView.as_view())),
+    path("async/professionals/<int:professional_id>/resume", csrf_exempt(AsyncResumeUploadView.as_view())),
 ]
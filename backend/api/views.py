@@ -1,18 +1,54 @@
+import json
 import logging
-from django.db import transaction
-from django.db.models import Q
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from rest_framework import status
 from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
+from .instrumentation import timed
 from .models import Professional, ResumeUpload
+from .pagination import ProfessionalCursorPagination
 from .serializers import (
-    ProfessionalCreateSerializer,
+    ProfessionalBulkItemSerializer,
     ProfessionalListSerializer,
+    ProfessionalListValuesSerializer,
     ResumeUploadSerializer,
+    parse_include_resume,
 )
-from .services.resume_extractor import extract_text_from_pdf
+from .services.direct_upload import (
+    DirectUploadError,
+    DirectUploadUnavailable,
+    complete_resume_upload,
+    presign_resume_upload,
+)
+from .services.extraction_queue import enqueue_extraction
+from .services.idempotency import idempotent
+from .services.list_cache import (
+    bump_list_version,
+    cache_page,
+    get_cached_page,
+    get_list_version,
+    not_modified,
+    validator_headers,
+)
+from .services.professional_export import iter_csv, iter_ndjson
+from .services.professional_import import (
+    FORMATS as IMPORT_FORMATS,
+    IMPORT_CHUNK_SIZE,
+    MAX_IMPORT_CHUNK_SIZE,
+    import_records,
+    iter_records,
+)
+from .services.professional_stats import professional_stats
+from .services.professional_upsert import bulk_upsert_professionals, upsert_professional
+from .services.resume_batch import ResumeBatchError, ingest_resumes, iter_archive, iter_files, parse_manifest
+from .services.resume_dedup import Sha256UploadHandler, cache_text, find_stored_twin, get_cached_text, sha256_of
+from .services.resume_ingest import store_and_extract, wants_inline_extraction
+from .services.search import SearchQueryError, search_professional_ids
 
 logger = logging.getLogger("api")
 
@@ -22,59 +58,194 @@ class ProfessionalsView(APIView):
     Save and get professional profiles
 
     POST /api/professionals/
-    GET  /api/professionals/?source=direct|partner|internal&include_resume=true
+    GET  /api/professionals/?source=direct|partner|internal&include_resume=true&limit=50&cursor=<next>
+
+    - POST with an Idempotency-Key header is safe to retry, see services.idempotency
     """
     parser_classes = [JSONParser]
+    pagination_class = ProfessionalCursorPagination
 
+    @idempotent("professionals.create")
     def post(self, request):
-        email = (request.data.get("email") or "").strip() or None
-        phone = (request.data.get("phone") or "").strip() or None
+        # unique validators are dropped, the upsert statement resolves the identity atomically
+        serializer = ProfessionalBulkItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        # upsert if email exist, if not use phone
-        find_via_email_phone = Q(email=email) if email else Q(phone=phone)
-        existing = Professional.objects.filter(find_via_email_phone).first() if (email or phone) else None
+        try:
+            # upsert if email exist, if not use phone
+            professional, created = upsert_professional(serializer.validated_data)
+        except IntegrityError:
+            # the email row exists but the phone belongs to someone else
+            return Response({"phone": ["professional with this phone already exists."]}, status=400)
+
+        logger.info(
+            "Created professional" if created else "Updated professional",
+            extra={"professional_id": professional.id, "source": professional.source},
+        )
 
-        serializer = ProfessionalCreateSerializer(instance=existing, data=request.data)
-        serializer.is_valid(raise_exception=True)
+        return Response(
+            ProfessionalListSerializer(professional, context={"request": request}).data,
+            status=201 if created else 200,
+        )
 
-        if existing:
-            professional = serializer.save()
+    def get(self, request):
+        """
+        keyset paginated, follow `next` until it is null
+
+        pages are cached per query string under the directory version, writes bump the version;
+        the ETag lets pollers revalidate with a 304 and no query at all
+        """
+        version = get_list_version()
+        headers = validator_headers(version, request)
 
-            logger.info(
-                "Updated professional",
-                extra={
-                    "professional_id": professional.id,
-                    "source": professional.source
-                })
-            return Response(
-                ProfessionalListSerializer(professional, context={"request": request}).data,
-                status=200,
-            )
+        if not_modified(version, request, headers):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        professional = serializer.save()
-        logger.info("Created professional", extra={"professional_id": professional.id, "source": professional.source})
+        data = get_cached_page(version, request)
+        if data is not None:
+            return Response(data, headers=headers)
 
-        return Response(ProfessionalListSerializer(professional, context={"request": request}).data, status=201)
+        response = self._list(request)
+        cache_page(version, request, response.data)
+
+        for header, value in headers.items():
+            response[header] = value
+
+        return response
+
+    def _list(self, request):
+        qs = Professional.objects.all()
+        source = request.query_params.get("source")
+
+        if source:
+            qs = qs.filter(source=source)
+
+        # values() rows joined to the resume in the same query when requested, only the columns the list shows
+        serializer = ProfessionalListValuesSerializer(request)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(serializer.values(qs), request, view=self)
+
+        with timed("serialize"):
+            data = serializer.many(page)
+
+        logger.info("Fetching professionals", extra={"returned": len(data), "source": source})
+        return paginator.get_paginated_response(data)
+
+
+class ProfessionalsSearchView(APIView):
+    """
+    Full text search over professionals and their resume text
+
+    GET /api/professionals/search?q=<words>&limit=20&cursor=<next>&include_resume=true
+
+    - every word must match (prefix match), best matches first
+    - sqlite fts5 / postgres tsvector, kept in sync by triggers (see services.search)
+    """
+    max_limit = 100
 
     def get(self, request):
-        """
-        @todo: paginate later
-        """
-        qs = Professional.objects.all().order_by("-created_at")
+        q = request.query_params.get("q", "")
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), self.max_limit)
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=400)
+
+        try:
+            ids, next_cursor = search_professional_ids(q, limit, request.query_params.get("cursor"))
+        except SearchQueryError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        qs = ProfessionalListSerializer.get_optimized_queryset(Professional.objects.filter(id__in=ids), request)
+        by_id = {professional.id: professional for professional in qs}
+        ranked = [by_id[pk] for pk in ids if pk in by_id]
+
+        with timed("serialize"):
+            data = ProfessionalListSerializer(ranked, many=True, context={"request": request}).data
+
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+
+        logger.info("Searched professionals", extra={"returned": len(data)})
+        return Response({"next": next_url, "results": data}, status=200)
+
+
+class ProfessionalsStatsView(APIView):
+    """
+    Dashboard aggregates, read from summary tables the writes keep current (see services.professional_stats)
+
+    GET /api/professionals/stats?since=2026-01-01&until=2026-01-31&source=direct&top=10
+
+    - `by_day`, `by_source` and `total` within since/until (utc days, inclusive) and source
+    - `top_companies` / `top_job_titles` all time, blanks left out
+    - cost grows with days x sources, not with professionals; ETag/304 like the list
+    """
+    max_top = 100
+
+    def get(self, request):
+        version = get_list_version()
+        headers = validator_headers(version, request)
+
+        if not_modified(version, request, headers):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        window = {}
+        for param in ("since", "until"):
+            raw = request.query_params.get(param)
+            try:
+                window[param] = parse_date(raw) if raw else None
+                if raw and window[param] is None:
+                    raise ValueError(raw)
+            except ValueError:
+                return Response({"detail": f"{param} must be a date (YYYY-MM-DD)"}, status=400)
+
+        try:
+            top = min(max(int(request.query_params.get("top", 10)), 1), self.max_top)
+        except ValueError:
+            return Response({"detail": "top must be an integer"}, status=400)
+
+        source = request.query_params.get("source")
+        data = professional_stats(**window, source=source, top=top)
+
+        logger.info("Fetching professional stats", extra={"days": len(data["by_day"]), "source": source})
+        return Response(data, headers=headers)
+
+
+class ProfessionalsExportView(APIView):
+    """
+    Stream the whole directory, memory stays flat regardless of row count
+
+    GET /api/professionals/export.ndjson?source=direct|partner|internal&include_resume=true
+    GET /api/professionals/export.csv
+    """
+    exporters = {
+        "ndjson": (iter_ndjson, "application/x-ndjson"),
+        "csv": (iter_csv, "text/csv"),
+    }
+
+    def get(self, request, fmt: str):
+        if fmt not in self.exporters:
+            return Response({"detail": f"format must be one of: {sorted(self.exporters)}"}, status=404)
+
+        qs = Professional.objects.all()
         source = request.query_params.get("source")
 
         if source:
             qs = qs.filter(source=source)
 
-        include_resume = request.query_params.get("include_resume") == "true"
-        if include_resume:
-            qs = qs.select_related("resume")  # avoid N+1 db queries
+        include_resume = parse_include_resume(request)
+        exporter, content_type = self.exporters[fmt]
 
-        data = ProfessionalListSerializer(qs, many=True, context={"request": request}).data
+        response = StreamingHttpResponse(
+            exporter(qs, include_resume=include_resume, build_uri=request.build_absolute_uri),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="professionals.{fmt}"'
 
-        # @todo: update logs to be more informative
-        logger.info(f"Fetching professionals: returned {len(data)}")
-        return Response(data, status=200)
+        logger.info("Exporting professionals", extra={"format": fmt, "source": source})
+        return response
 
 
 class ProfessionalsBulkUpsertView(APIView):
@@ -84,79 +255,187 @@ class ProfessionalsBulkUpsertView(APIView):
 
     - upsert by email if present else phone
     - for partial success, return partial success
+    - validated in one pass and written in batches, see services.professional_upsert
+    - an Idempotency-Key header replays the first summary to retries instead of upserting again
     """
     parser_classes = [JSONParser]
 
+    @idempotent("professionals.bulk")
     def post(self, request):
         if not isinstance(request.data, list):
             return Response({"detail": "Expected a list of profiles."}, status=400)
 
-        results = []
-        created = 0
-        updated = 0
-        failed = 0
+        summary = bulk_upsert_professionals(request.data)
 
-        for idx, professional in enumerate(request.data):
-            try:
-                email = (professional.get("email") or "").strip() or None
-                phone = (professional.get("phone") or "").strip() or None
-
-                if not email and not phone:
-                    failed += 1
-                    results.append(
-                        {
-                            "index": idx,
-                            "status": "failed",
-                            "error": "either email or phone is required"
-                        })
-
-                    continue # skip
-
-                # upsert record
-                find_via_email_phone = Q(email=email) if email else Q(phone=phone)
-
-                with transaction.atomic():
-                    existing = Professional.objects.filter(find_via_email_phone).first()
-
-                    serialized = ProfessionalCreateSerializer(instance=existing, data=professional)
-                    serialized.is_valid(raise_exception=True)
-
-                    if existing:
-                        professional = serialized.save()
-                        updated += 1
-                        results.append({"index": idx, "status": "updated", "id": professional.id})
-                    else:
-                        professional = Professional.objects.create(**serialized.validated_data)
-                        created += 1
-                        results.append({"index": idx, "status": "created", "id": professional.id})
-
-            except Exception as e:
-                logger.exception("bulk upsert item failed")
-                failed += 1
-                results.append({"index": idx, "status": "failed", "error": str(e)})
+        logger.info(
+            "Bulk upserted professionals",
+            extra={
+                "created_count": summary["created"],
+                "updated_count": summary["updated"],
+                "failed_count": summary["failed"],
+            })
 
-        return Response(
-            {
-                "created": created,
-                "updated": updated,
-                "failed": failed,
-                "results": results
-            },
+        return Response(summary, status=207)
+
+
+class ResumeBulkUploadView(APIView):
+    """
+    Many resumes in one request
+    POST /api/professionals/resumes/bulk
+
+    multipart/form-data:
+      archive   zip or tar(.gz) of the files          (or)  files  repeated file parts
+      manifest  json list or csv: file + one of professional_id, email, phone
+
+    - files are stored and extracted in batches, extraction runs across a process pool
+    - per manifest row 207 report: created/updated/unchanged/failed, queued extractions, skipped files
+    """
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        manifest = request.FILES.get("manifest") or request.data.get("manifest")
+        if not manifest:
+            return Response({"detail": "missing manifest"}, status=400)
+
+        archive = request.FILES.get("archive")
+        files = request.FILES.getlist("files")
+        if not archive and not files:
+            return Response({"detail": "send an archive or files"}, status=400)
+
+        try:
+            rows = parse_manifest(manifest.read() if hasattr(manifest, "read") else manifest)
+            summary = ingest_resumes(iter_archive(archive) if archive else iter_files(files), rows)
+        except ResumeBatchError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        logger.info(
+            "Bulk uploaded resumes",
+            extra={
+                "created_count": summary["created"],
+                "updated_count": summary["updated"],
+                "failed_count": summary["failed"],
+                "queued_count": summary["queued"],
+            })
+
+        return Response(summary, status=207)
+
+
+class ProfessionalsImportView(APIView):
+    """
+    Streaming bulk import for large partner feeds
+    POST /api/professionals/import?chunk_size=1000
+
+    Content-Type: application/x-ndjson (one profile per line) or text/csv (header row)
+
+    - the body is parsed line by line and upserted in chunks, one commit per chunk
+    - the response streams one NDJSON result per input line, then a summary line
+    """
+
+    def post(self, request):
+        fmt = IMPORT_FORMATS.get((request.content_type or "").split(";")[0].strip().lower())
+        if not fmt:
+            return Response({"detail": f"Content-Type must be one of: {sorted(IMPORT_FORMATS)}"}, status=415)
+
+        try:
+            chunk_size = int(request.query_params.get("chunk_size", IMPORT_CHUNK_SIZE))
+        except ValueError:
+            return Response({"detail": "chunk_size must be an integer"}, status=400)
+
+        chunk_size = min(max(chunk_size, 1), MAX_IMPORT_CHUNK_SIZE)
+
+        # raw body stream, never materialized by a parser
+        stream = request.stream
+        if stream is None:
+            return Response({"detail": "empty body"}, status=400)
+
+        results = import_records(iter_records(stream, fmt), chunk_size=chunk_size)
+
+        logger.info("Importing professionals", extra={"format": fmt, "chunk_size": chunk_size})
+        return StreamingHttpResponse(
+            (json.dumps(result) + "\n" for result in results),
+            content_type="application/x-ndjson",
             status=207,
         )
 
 
+class ResumeUploadUrlView(APIView):
+    """
+    Step 1 of a direct to storage upload
+    POST /api/professionals/<id>/resume/upload-url   {"filename": "cv.pdf"}
+
+    returns a pre-signed POST (url + form fields) for the bucket and an upload_token,
+    the client posts the file there and then calls .../resume/complete with the token
+    """
+    parser_classes = [JSONParser]
+
+    def post(self, request, professional_id: int):
+        professional = Professional.objects.filter(id=professional_id).first()
+
+        if not professional:
+            return Response({"detail": "professional not found"}, status=404)
+
+        try:
+            presigned = presign_resume_upload(professional, request.data.get("filename") or "resume.pdf")
+        except DirectUploadUnavailable as e:
+            return Response({"detail": str(e)}, status=501)
+
+        logger.info("Issued resume upload url", extra={"professional_id": professional.id})
+        return Response(presigned, status=200)
+
+
+class ResumeUploadCompleteView(APIView):
+    """
+    Step 2 of a direct to storage upload
+    POST /api/professionals/<id>/resume/complete   {"upload_token": "..."}
+
+    attaches the uploaded object and queues extraction, poll GET .../resume for extraction_status
+    """
+    parser_classes = [JSONParser]
+
+    def post(self, request, professional_id: int):
+        professional = Professional.objects.filter(id=professional_id).first()
+
+        if not professional:
+            return Response({"detail": "professional not found"}, status=404)
+
+        try:
+            resume = complete_resume_upload(professional, request.data.get("upload_token"))
+        except DirectUploadUnavailable as e:
+            return Response({"detail": str(e)}, status=501)
+        except DirectUploadError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        logger.info("Completed direct resume upload", extra={"professional_id": professional.id, "resume_id": resume.id})
+        return Response(ResumeUploadSerializer(resume).data, status=202)
+
+
 class ResumeUploadView(APIView):
     """
     POST /api/professionals/<id>/resume
+    GET  /api/professionals/<id>/resume
 
     multipart/form-data: filetype: pdf
 
-    stores file to cloud storage
+    stores file to cloud storage; small files are extracted while the upload is stored (201),
+    larger ones or slow extractions are queued (manage.py process_resumes, 202), poll GET for extraction_status
+
+    content is deduplicated by sha256: identical bytes skip the storage write and
+    previously extracted text is reused
     """
     parser_classes = [MultiPartParser, FormParser]
 
+    def get(self, request, professional_id: int):
+        resume = ResumeUpload.objects.filter(professional_id=professional_id).first()
+
+        if not resume:
+            return Response({"detail": "resume not found"}, status=404)
+
+        return Response(ResumeUploadSerializer(resume).data, status=200)
+
     def post(self, request, professional_id: int):
+        # hash while the body streams in, must be installed before request.FILES is touched
+        request._request.upload_handlers.insert(0, Sha256UploadHandler(request._request))
+
         professional = Professional.objects.filter(id=professional_id).first()
 
         if not professional:
@@ -166,22 +445,57 @@ class ResumeUploadView(APIView):
         if not pdf:
             return Response({"detail": "missing resume file"}, status=400)
 
-        # update or create the resume
-        resume, _ = ResumeUpload.objects.get_or_create(professional=professional)
-        resume.file = pdf
-        resume.save()
+        sha256 = getattr(request._request, "upload_sha256", {}).get("file") or sha256_of(pdf)
 
-        # --------------- extract text from resume
-        try:
-            with resume.file.open("rb") as f:
-                extracted = extract_text_from_pdf(f)
-        except Exception:
-            logger.exception("failed to open stored resume")
-            extracted = ""
+        resume = ResumeUpload.objects.filter(professional=professional).first()
+
+        # --------------- same bytes re-uploaded, nothing to store or extract
+        if resume and resume.content_sha256 == sha256 and resume.file:
+            logger.info("Resume unchanged", extra={"professional_id": professional.id, "resume_id": resume.id})
+            return Response(ResumeUploadSerializer(resume).data, status=200)
+
+        resume = resume or ResumeUpload(professional=professional)
+        resume.content_sha256 = sha256
 
-        resume.extracted_text = extracted
-        resume.save(update_fields=["extracted_text"])
+        # identical bytes already stored for someone else, share the object instead of another PUT
+        twin = find_stored_twin(sha256, exclude_id=resume.id)
+        if twin:
+            resume.file.name = twin.file.name
 
-        logger.info("Uploaded resume", extra={"professional_id": professional.id, "resume_id": resume.id})
+        text = get_cached_text(sha256)
+        cached = text is not None
+
+        # small files: PUT and extraction side by side on the uploaded bytes, large ones go to the queue
+        extract_now = not cached and wants_inline_extraction(pdf)
+        if not twin or extract_now:
+            extracted = store_and_extract(resume, pdf, store=not twin, extract=extract_now)
+            if extracted is not None:
+                text = extracted
+                cache_text(sha256, text)
+
+        # one row write, the object is already stored
+        resume.extracted_text = text or ""
+        resume.extraction_status = (
+            ResumeUpload.ExtractionStatus.DONE if text is not None else ResumeUpload.ExtractionStatus.PENDING
+        )
+        resume.save()
 
-        return Response(ResumeUploadSerializer(resume).data, status=201) # created
+        if text is None:
+            enqueue_extraction(resume)
+
+        bump_list_version()  # resume_url / resume_summary changed
+        logger.info(
+            "Uploaded resume",
+            extra={
+                "professional_id": professional.id,
+                "resume_id": resume.id,
+                "stored": not twin,
+                "extraction_cached": cached,
+                "extracted_inline": extract_now and text is not None,
+            })
+
+        with timed("serialize"):
+            data = ResumeUploadSerializer(resume).data
+
+        status_code = 201 if text is not None else 202  # accepted, extraction pending
+        return Response(data, status=status_code)
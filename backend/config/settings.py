@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from .database import database_from_url
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-secret-key")
@@ -21,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.instrumentation.RequestMetricsMiddleware",  # outermost, times everything below
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -50,12 +53,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
-# --------------------------- sqlite
+# --------------------------- database, sqlite (WAL) unless DATABASE_URL points at postgres (see config/database.py)
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_from_url(os.getenv("DATABASE_URL"), BASE_DIR),
 }
 
 AUTH_PASSWORD_VALIDATORS = []
@@ -108,4 +108,44 @@ if USE_S3:
         "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
     }
 
+# --------------------------- direct to storage resume uploads (POST .../resume/upload-url)
+RESUME_UPLOAD_URL_EXPIRY = int(os.getenv("RESUME_UPLOAD_URL_EXPIRY", "600"))  # seconds
+RESUME_MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# --------------------------- cache (locmem per process, set REDIS_URL to share it between web and worker)
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL},
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+
+# seconds, 0 disables the page cache and the ETag/304 validators; off by default on the per process locmem,
+# where a worker that missed another one's write would keep serving its old pages
+PROFESSIONALS_LIST_CACHE_TTL = int(os.getenv("PROFESSIONALS_LIST_CACHE_TTL", "300" if REDIS_URL else "0"))
+
+# --------------------------- Idempotency-Key on POST /api/professionals and /bulk (services.idempotency)
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(60 * 60 * 24)))  # seconds a stored response is replayed
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "30"))  # seconds a duplicate waits, then 409
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "300"))  # seconds, then an in flight key is taken over
+
+# --------------------------- resume extraction queue (manage.py process_resumes)
+RESUME_EXTRACTION_TIMEOUT = int(os.getenv("RESUME_EXTRACTION_TIMEOUT", "30"))  # seconds, 0 runs inline
+RESUME_EXTRACTION_MAX_ATTEMPTS = int(os.getenv("RESUME_EXTRACTION_MAX_ATTEMPTS", "3"))
+RESUME_EXTRACTION_RETRY_DELAY = int(os.getenv("RESUME_EXTRACTION_RETRY_DELAY", "10"))  # seconds, doubled per attempt
+# seconds a running job stays with its worker before another may take it over (the first one died); twice the
+# timeout, a fixed 300 when extraction runs inline without one
+RESUME_EXTRACTION_LEASE = int(os.getenv("RESUME_EXTRACTION_LEASE", str(RESUME_EXTRACTION_TIMEOUT * 2 or 300)))
+RESUME_EXTRACTION_MAX_PAGES = int(os.getenv("RESUME_EXTRACTION_MAX_PAGES", "50"))
+RESUME_EXTRACTION_TIME_LIMIT = float(os.getenv("RESUME_EXTRACTION_TIME_LIMIT", "20"))  # seconds, soft cap checked per page
+RESUME_EXTRACTION_WORKERS = int(os.getenv("RESUME_EXTRACTION_WORKERS", "1"))  # > 1 splits large pdfs across processes
+RESUME_INLINE_EXTRACTION_MAX_BYTES = int(os.getenv("RESUME_INLINE_EXTRACTION_MAX_BYTES", str(2 * 1024 * 1024)))  # 0 queues all
+RESUME_INLINE_EXTRACTION_TIMEOUT = float(os.getenv("RESUME_INLINE_EXTRACTION_TIMEOUT", "5"))  # seconds, then queued
+RESUME_BATCH_WORKERS = int(os.getenv("RESUME_BATCH_WORKERS", str(os.cpu_count() or 1)))  # extraction processes per bulk upload
+RESUME_TEXT_CACHE_TTL = int(os.getenv("RESUME_TEXT_CACHE_TTL", str(60 * 60 * 24)))  # extracted text keyed by sha256
+
 CORS_ALLOWED_ORIGINS = ["http://localhost:5173"]
\ No newline at end of file